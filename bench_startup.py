@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+bench_startup.py – măsoară costul de import al modulelor folosite la rezolvare
+
+ ► Pentru fiecare modul rulează `python -X importtime -c "import <modul>"` de mai multe ori
+   și păstrează cel mai mic timp cumulat (fără pornirea interpretorului).
+ ► Eșuează (exit 1) dacă un modul depășește bugetul sau încarcă stiva de plotting / GIF:
+   acestea trebuie încărcate doar la --gif / plot_map.
+
+Exemplu:
+    python3 bench_startup.py --repeat 5
+"""
+
+import argparse
+import subprocess
+import sys
+
+# Buget (secunde) pentru importul cumulat al fiecărui modul
+BUDGETS = {
+    "sokoban.map": 0.10,
+    "search_methods.solver": 0.15,
+    "main": 0.20,
+}
+# Module grele care nu au ce căuta într-o rulare fără --gif
+HEAVY = ("matplotlib", "imageio", "PIL", "pandas", "numpy")
+
+
+def import_time(module):
+    """Timpul cumulat (s) raportat de -X importtime pentru modul + modulele grele încărcate."""
+    code = f"import sys, {module}; print(','.join(h for h in {HEAVY!r} if h in sys.modules))"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, check=True)
+    cumulative = 0
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative = int(parts[1])
+    loaded = [h for h in proc.stdout.strip().split(",") if h]
+    return cumulative / 1e6, loaded
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark timp de import")
+    p.add_argument('--repeat', type=int, default=5)
+    args = p.parse_args()
+
+    failed = False
+    for module, budget in BUDGETS.items():
+        runs = [import_time(module) for _ in range(args.repeat)]
+        best = min(t for t, _ in runs)
+        loaded = runs[0][1]
+        ok = best <= budget and not loaded
+        failed |= not ok
+        icon = "✅" if ok else "❌"
+        print(f"{icon} {module:<24} {best * 1000:7.1f} ms (buget {budget * 1000:.0f} ms)"
+              + (f" | încarcă: {', '.join(loaded)}" if loaded else ""))
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+build_pdb.py – construiește offline bazele de tipare (pattern databases) pt euristicile pdb / pdb-max
+
+ ► Pentru fiecare hartă și fiecare mărime de tipar, BFS retrograd de la ținte; rezultatul ajunge în
+   DIR/<amprenta hărții>-pdb<k>.bin, exact fișierul pe care main.py --pdb-dir DIR îl mapează în memorie.
+ ► O bază deja construită pentru aceeași hartă (aceeași amprentă) nu se reconstruiește.
+
+Exemplu:
+    python3 build_pdb.py .pdb --sizes 2 3
+    python3 main.py astar tests/super_hard_map1.yaml --heuristic pdb --pdb-dir .pdb --pdb-size 3
+"""
+
+import argparse
+import glob
+import os
+import time
+
+from sokoban.map import Map
+from search_methods.pdb import SIZES, PatternDatabase
+
+
+def main():
+    p = argparse.ArgumentParser(description="Construieste bazele de tipare pt hartile date")
+    p.add_argument('directory', help="Directorul cache (acelasi ca --pdb-dir)")
+    p.add_argument('--maps', default='tests/*.yaml')
+    p.add_argument('--sizes', type=int, nargs='+', choices=SIZES, default=[2])
+    p.add_argument('--push-only', action='store_true',
+                   help="Bazele pt hartile fara pull-uri (alta amprenta, alt fisier)")
+    args = p.parse_args()
+
+    for path in sorted(glob.glob(args.maps)):
+        level = Map.from_yaml(path, allow_pulls=not args.push_only).level
+        for size in args.sizes:
+            t0 = time.perf_counter()
+            database = PatternDatabase.load_or_build(level, size, args.directory)
+            dt = time.perf_counter() - t0
+            print(f"✅ {path:<28} k={size} {len(database):>7} intrări "
+                  f"{os.path.getsize(database.path):>8} B  {dt:.2f}s")
+            database.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+check_movegen.py – test diferențial: generatorul pe bitboard-uri vs tabelele de vecini
+
+ ► Pentru fiecare hartă din tests/*.yaml (cu și fără pull-uri) face plimbări aleatoare și,
+   în fiecare stare, compară mutările posibile și succesorii celor două generatoare,
+   plus mutările date de Map.filter_possible_moves.
+ ► Eșuează (exit 1) la prima diferență și afișează harta, starea și cele două rezultate.
+
+Exemplu:
+    python3 check_movegen.py --walks 20 --length 300
+"""
+
+import argparse
+import glob
+import random
+import sys
+
+from sokoban.map import Map
+
+
+def generators(state):
+    """(mutări, succesori) ale stării cu tabelele de vecini și cu bitboard-urile."""
+    level = state.level
+    level.use_bitboards(False)
+    tables = state.filter_possible_moves(), state.successors()
+    level.use_bitboards(True)
+    bitboards = state.filter_possible_moves(), state.successors()
+    level.use_bitboards(False)
+    return tables, bitboards
+
+
+def check_map(path, allow_pulls, walks, length, rng):
+    """Numărul de stări verificate; ridică AssertionError la prima diferență."""
+    start = Map.from_yaml(path, allow_pulls=allow_pulls)
+    checked = 0
+    for _ in range(walks):
+        state = start.to_state()
+        for _ in range(length):
+            (moves_t, succ_t), (moves_b, succ_b) = generators(state)
+            same_states = all(m1 == m2 and s1 == s2 and s1.zhash == s2.zhash
+                              for (m1, s1), (m2, s2) in zip(succ_t, succ_b))
+            map_moves = state.to_map().filter_possible_moves()
+            if moves_t != moves_b or moves_t != map_moves or len(succ_t) != len(succ_b) or not same_states:
+                raise AssertionError(
+                    f"{path} (pull-uri: {allow_pulls})\n{state}\n"
+                    f"tabele: {moves_t} | bitboard: {moves_b} | Map: {map_moves}")
+            checked += 1
+            if not succ_t:
+                break
+            state = rng.choice(succ_t)[1]
+    return checked
+
+
+def main():
+    p = argparse.ArgumentParser(description="Test diferențial pt generatorul de mutări")
+    p.add_argument('--maps', default='tests/*.yaml')
+    p.add_argument('--walks', type=int, default=20)
+    p.add_argument('--length', type=int, default=300)
+    p.add_argument('--seed', type=int, default=0)
+    args = p.parse_args()
+
+    rng = random.Random(args.seed)
+    failed = False
+    for path in sorted(glob.glob(args.maps)):
+        for allow_pulls in (True, False):
+            try:
+                checked = check_map(path, allow_pulls, args.walks, args.length, rng)
+                print(f"✅ {path:<28} pull-uri: {allow_pulls!s:<5} {checked} stări")
+            except AssertionError as e:
+                failed = True
+                print(f"❌ {e}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,129 +1,227 @@
-#!/usr/bin/env python3
-"""
-main.py – Driver adaptiv pt Tema 1 Sokoban
-"""
-
-import argparse
-import time
-import os
-import shutil
-from pathlib import Path
-
-import imageio.v2 as imageio
-
-from sokoban.map import Map
-from search_methods.solver import (
-    get_solver,
-    LrtaStarSolver,
-    GreedySolver,
-    SimulatedAnnealingSolver
-)
-
-
-def load_map(path: str) -> Map:
-    return Map.from_yaml(path)
-
-
-def save_gif(states, yaml_path, out_dir="images", fps=5):
-    name = Path(yaml_path).stem
-    os.makedirs(out_dir, exist_ok=True)
-
-    tmp_dir = Path("tmp_frames")
-    if tmp_dir.exists():
-        shutil.rmtree(tmp_dir)
-    tmp_dir.mkdir()
-
-    frames = []
-    for i, st in enumerate(states):
-        png_name = f"{name}_{i:04d}.png"
-        # Map.save_map(dir_path, save_name)
-        st.save_map(str(tmp_dir), png_name)
-        frames.append(imageio.imread(tmp_dir / png_name))
-
-    gif_path = Path(out_dir) / f"{name}.gif"
-    imageio.mimsave(gif_path, frames, fps=fps)
-    print(f"[GIF] salvat în {gif_path}")
-
-    shutil.rmtree(tmp_dir)
-
-def run_solver(
-    algorithm: str,
-    heuristic_type: str,
-    map_path: str,
-    make_gif: bool = False,
-    max_steps: int | None = None
-):
-    print(f"DEBUG: {algorithm}  h={heuristic_type}  map={map_path}")
-
-    # 1) Incarca harta
-    state = load_map(map_path)
-
-    # 2) Buget implicit
-    if max_steps is None:
-        if 'super_hard' in map_path:
-            max_steps = 400_000
-        elif 'large' in map_path:
-            max_steps = 300_000
-        else:
-            max_steps = 150_000
-
-    # 3) Upgrade euristica
-    auto_h = heuristic_type
-    if auto_h == 'base' and ('large' in map_path or 'super_hard' in map_path):
-        auto_h = 'enhanced'
-        print("  INFO: folosim euristica enhanced pe harta mare")
-
-    # 4) Construieste solver
-    solver = get_solver(algorithm, state, auto_h, max_steps)
-
-    # 5) Ruleaza
-    t0 = time.perf_counter()
-    try:
-        states = solver.solve()
-    except Exception as e:
-        print(f"[{algorithm}] {map_path} | ERROR: {e}")
-        return
-    dt = time.perf_counter() - t0
-
-    # 6) Metrici
-    solved = states and states[-1].is_solved()
-    steps = len(states) - 1 if states else 0
-    pulls = 0
-
-    extra = ""
-    if isinstance(solver, LrtaStarSolver):
-        extra = f" | H_size: {len(solver._solver.H)}"
-    elif isinstance(solver, GreedySolver):
-        extra = f" | Greedy_iters: {solver.last_steps}"
-    elif isinstance(solver, SimulatedAnnealingSolver):
-        extra = f" | SA_iters: {solver.last_steps}"
-
-    status = "SOLVED" if solved else "NOT_SOLVED"
-    print(f"[{algorithm}] {map_path} | h={auto_h} | time: {dt:.2f}s | "
-          f"steps: {steps} | pulls: {pulls} | status: {status}{extra}")
-
-    # 7) GIF
-    if make_gif and solved:
-        save_gif(states, map_path)
-
-
-def parse_cli():
-    p = argparse.ArgumentParser(description="Sokoban adaptive driver")
-    p.add_argument('algorithm', choices=['lrta*', 'sa'])
-    p.add_argument('--heuristic', choices=['base', 'enhanced'], default='base')
-    p.add_argument('yaml_map', help="Fișier .yaml cu harta Sokoban")
-    p.add_argument('--max-steps', type=int, default=None,
-                   help="Buget pași LRTA*/Greedy")
-    p.add_argument('--gif', action='store_true', help="Salveaza solutia ca GIF")
-    return p.parse_args()
-
-
-if __name__ == '__main__':
-    args = parse_cli()
-    run_solver(
-        args.algorithm,
-        args.heuristic,
-        args.yaml_map,
-        args.gif,
-        args.max_steps
-    )
+#!/usr/bin/env python3
+"""
+main.py – Driver adaptiv pt Tema 1 Sokoban
+"""
+
+import argparse
+import json
+from dataclasses import replace
+from pathlib import Path
+
+from sokoban.map import Map
+from search_methods.heuristics import heuristic_cache_stats, set_heuristic_cache_size
+from search_methods.solver import (
+    ADMISSIBLE_HEURISTICS, ALGORITHMS, HEURISTICS, MOVE_GENERATORS, OPTIMAL_ALGORITHMS,
+    SolverOptions, default_heuristic, get_solver,
+)
+
+# Metrici specifice unui algoritm, afisate pe linia de status (daca solverul le raporteaza)
+STATUS_METRICS = ('H_size', 'Greedy_iters', 'SA_iters', 'generated', 'iterations', 'forward', 'backward',
+                  'winner', 'stage')
+
+
+def load_map(path: str, allow_pulls: bool = True) -> Map:
+    return Map.from_yaml(path, allow_pulls=allow_pulls)
+
+
+def save_gif(states, yaml_path, out_dir="images", fps=5):
+    # Cadrele se deseneaza direct in memorie si se scriu pe rand in GIF (fara tmp_frames/)
+    from sokoban.render import write_gif
+
+    gif_path = Path(out_dir) / f"{Path(yaml_path).stem}.gif"
+    write_gif(states, gif_path, fps=fps)
+    print(f"[GIF] salvat în {gif_path}")
+
+def run_solver(
+    algorithm: str,
+    map_path: str,
+    options: SolverOptions | None = None,
+    *,
+    state: Map | None = None,
+    make_gif: bool = False,
+    push_only: bool = False,
+    h_cache_size: int | None = None,
+    profile: bool = False,
+    profile_path: str | None = None,
+    as_json: bool = False
+) -> dict:
+    """
+    Ruleaza un algoritm pe o harta si intoarce rezultatul structurat (si metricile solverului).
+    options tine tot ce ajunge la solver (vezi SolverOptions); restul parametrilor tin de rulare.
+    """
+    options = options or SolverOptions()
+    if options.heuristic is None:
+        options = replace(options, heuristic=default_heuristic(algorithm))
+    print(f"DEBUG: {algorithm}  h={options.heuristic}  map={map_path}")
+
+    # 1) Incarca harta (fara pull-uri, tabela de patrate moarte devine mult mai stricta)
+    #    run_all.py trimite harta deja incarcata
+    if state is None:
+        state = load_map(map_path, allow_pulls=not push_only)
+
+    # 2) Buget implicit
+    if options.max_steps is None:
+        if 'super_hard' in map_path:
+            options = replace(options, max_steps=400_000)
+        elif 'large' in map_path:
+            options = replace(options, max_steps=300_000)
+        else:
+            options = replace(options, max_steps=150_000)
+
+    # 3) Upgrade euristica (doar pt metodele incomplete, A*/IDA* raman pe euristica aleasa)
+    if (options.heuristic == 'base' and algorithm in ('lrta*', 'sa', 'portfolio')
+            and ('large' in map_path or 'super_hard' in map_path)):
+        options = replace(options, heuristic='enhanced')
+        print("  INFO: folosim euristica enhanced pe harta mare")
+    auto_h = options.heuristic
+    if algorithm in OPTIMAL_ALGORITHMS and auto_h not in ADMISSIBLE_HEURISTICS:
+        print(f"  AVERTISMENT: euristica {auto_h} nu e admisibila, solutia {algorithm} poate sa nu fie optima")
+
+    if h_cache_size:
+        set_heuristic_cache_size(h_cache_size)
+
+    # 4) Construieste solver
+    solver = get_solver(algorithm, state, options)
+
+    result = {
+        "map": map_path,
+        "algorithm": algorithm,
+        "heuristic": auto_h,
+        "seed": options.seed,
+        "solved": False,
+        "time_s": 0.0,
+        "steps": 0,
+        "pulls": 0,
+        "error": None,
+        "metrics": None,
+    }
+
+    # 5) Ruleaza (timpul si contoarele le tine solverul in solver.stats)
+    try:
+        trace = solver.run(profile=profile, profile_path=profile_path)
+    except Exception as e:
+        print(f"[{algorithm}] {map_path} | ERROR: {e}")
+        result["error"] = str(e)
+        result["metrics"] = solver.metrics()
+        if as_json:
+            print(json.dumps(result))
+        return result
+    dt = solver.stats.total_time
+
+    # 6) Metrici
+    solved = trace.is_solved()
+    steps = len(trace)
+    pulls = trace.pulls()
+    metrics = solver.metrics()
+
+    extra = f" | expanded: {metrics['expansions']}"
+    for key in STATUS_METRICS:
+        if key in metrics:
+            extra += f" | {key}: {metrics[key]}"
+
+    if solver.profile_report:
+        print(solver.profile_report)
+
+    cache = heuristic_cache_stats()
+    print(f"  h-cache: {cache['size']}/{cache['maxsize']} | hits: {cache['hits']} | "
+          f"misses: {cache['misses']} | evictions: {cache['evictions']}")
+    succ = metrics.get('succ_cache')
+    if succ:
+        print(f"  succ-cache: {succ['size']}/{succ['maxsize']} | hits: {succ['hits']} | "
+              f"misses: {succ['misses']} | hit rate: {succ['hit_rate']:.1%}")
+
+    status = "SOLVED" if solved else "NOT_SOLVED"
+    print(f"[{algorithm}] {map_path} | h={auto_h} | time: {dt:.2f}s | "
+          f"steps: {steps} | pulls: {pulls} | status: {status}{extra}")
+
+    # 7) GIF
+    if make_gif and solved:
+        save_gif(trace.states(), map_path)
+
+    result.update(solved=bool(solved), time_s=dt, steps=steps, pulls=pulls, metrics=metrics)
+    if as_json:
+        print(json.dumps(result))
+    return result
+
+
+def parse_cli():
+    p = argparse.ArgumentParser(description="Sokoban adaptive driver")
+    p.add_argument('algorithm', choices=ALGORITHMS)
+    p.add_argument('--heuristic', choices=list(HEURISTICS), default=None,
+                   help="Implicit push pt astar / idastar (admisibila), base pt restul")
+    p.add_argument('yaml_map', help="Fișier .yaml cu harta Sokoban")
+    p.add_argument('--max-steps', type=int, default=None,
+                   help="Buget pași LRTA*/Greedy")
+    p.add_argument('--gif', action='store_true', help="Salveaza solutia ca GIF")
+    p.add_argument('--push-only', action='store_true',
+                   help="Interzice tragerea cutiilor (deadlock pruning complet)")
+    p.add_argument('--h-cache-size', type=int, default=None,
+                   help="Numar maxim de valori h pastrate in cache (LRU)")
+    p.add_argument('--macro', action='store_true',
+                   help="Cautare pe mutari de cutii (regiunea jucatorului e normalizata)")
+    p.add_argument('--weight', type=float, default=None,
+                   help="Pondere w pt A* (f = g + w·h, implicit 1), w > 1 = suboptimal dar mai rapid; "
+                        "la gbfs, prioritatea devine g + w·h in loc de h")
+    p.add_argument('--json', action='store_true',
+                   help="Afiseaza rezultatul si metricile solverului ca JSON (ultima linie)")
+    p.add_argument('--profile', nargs='?', const='', default=None, metavar='FILE',
+                   help="Ruleaza solve() sub cProfile; optional salveaza profilul brut in FILE")
+    p.add_argument('--movegen', choices=MOVE_GENERATORS, default='tables',
+                   help="Generatorul de mutari: tabele de vecini sau bitboard-uri (int-uri Python)")
+    p.add_argument('--h-store', default=None, metavar='DIR',
+                   help="Director in care LRTA* pastreaza valorile h invatate intre rulari")
+    p.add_argument('--h-store-size', type=int, default=1_000_000,
+                   help="Numar maxim de valori pastrate pe disc per harta (se elimina cele mai vechi)")
+    p.add_argument('--trials', type=int, default=1,
+                   help="LRTA*: trial-uri repetate pastrand H, pana se stabilizeaza lungimea solutiei")
+    p.add_argument('--time-budget', type=float, default=None, metavar='S',
+                   help="LRTA*: buget de timp (secunde) pt toate trial-urile")
+    p.add_argument('--sa-workers', type=int, default=1,
+                   help="SA: lanturile ruleaza in paralel pe N procese (rezultat determinist per seed)")
+    p.add_argument('--sa-exchange', type=int, default=None, metavar='K',
+                   help="SA: la fiecare K pasi lanturile vecine isi schimba starile (replica exchange)")
+    p.add_argument('--sa-incremental', action='store_true',
+                   help="SA: o mutare aleatoare aplicata pe loc (cu undo) si delta incremental, fara copii")
+    p.add_argument('--succ-cache-size', type=int, default=None, metavar='N',
+                   help="Cache LRU de transpozitii: succesorii si h-urile a cel mult N stari revizitate")
+    p.add_argument('--pdb-dir', default=None, metavar='DIR',
+                   help="Director cache pt bazele de tipare (euristicile pdb / pdb-max), per amprenta hartii")
+    p.add_argument('--pdb-size', type=int, choices=[2, 3], default=2,
+                   help="Numarul de cutii dintr-un tipar al bazei de date")
+    return p.parse_args()
+
+
+def solver_options(args) -> SolverOptions:
+    """SolverOptions din argumentele CLI."""
+    return SolverOptions(
+        heuristic=args.heuristic,
+        max_steps=args.max_steps,
+        macro=args.macro,
+        weight=args.weight,
+        movegen=args.movegen,
+        h_store=args.h_store,
+        h_store_size=args.h_store_size,
+        trials=args.trials,
+        time_budget=args.time_budget,
+        sa_workers=args.sa_workers,
+        sa_exchange=args.sa_exchange,
+        sa_incremental=args.sa_incremental,
+        succ_cache_size=args.succ_cache_size,
+        pdb_dir=args.pdb_dir,
+        pdb_size=args.pdb_size
+    )
+
+
+if __name__ == '__main__':
+    args = parse_cli()
+    run_solver(
+        args.algorithm,
+        args.yaml_map,
+        solver_options(args),
+        make_gif=args.gif,
+        push_only=args.push_only,
+        h_cache_size=args.h_cache_size,
+        profile=args.profile is not None,
+        profile_path=args.profile or None,
+        as_json=args.json
+    )
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+run_all.py – rulează toate hărțile din tests/ în paralel și scrie CSV-urile pentru raport
+
+ ► Înlocuiește run_all_lrta.sh / run_all_sa.sh:
+     - hărțile se încarcă o singură dată (în procesul principal) și se trimit worker-ilor
+     - fiecare job (hartă, algoritm, euristică, seed) rulează într-un ProcessPoolExecutor, pe toate core-urile
+     - metricile vin direct din rezultatul structurat al main.run_solver, fără parsare de stdout
+ ► OUTPUT (aceeași schemă ca înainte, plus coloana stages – etapa AdaptiveSolver care a rezolvat):
+     results_lrta.csv, results_sa.csv        – euristica base
+     results_<alg>_<euristică>.csv           – celelalte combinații
+
+Exemplu:
+    python3 run_all.py --algorithms "lrta*" sa --runs 10
+"""
+
+import argparse
+import contextlib
+import csv
+import glob
+import io
+import os
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from main import load_map, run_solver
+from search_methods.heuristics import clear_heuristic_cache
+from search_methods.solver import ALGORITHMS, HEURISTICS, SolverOptions, default_heuristic
+
+CSV_COLUMNS = [
+    "Test", "solved", "not_solved",
+    "avg_time_s", "min_time_s", "max_time_s",
+    "avg_steps", "min_steps", "max_steps",
+    "avg_pulls", "min_pulls", "max_pulls",
+    "total_time_s",
+    "stages",
+]
+OUT_FILES = {
+    "lrta*": "results_lrta.csv",
+    "sa": "results_sa.csv",
+}
+
+# Hărțile încărcate, primite o singură dată de fiecare worker
+_MAPS = {}
+
+
+def _init_worker(maps):
+    global _MAPS
+    _MAPS = maps
+
+
+def _run_chain(jobs):
+    """Rulează joburile unul după altul, în același proces (vezi run_batch)."""
+    return [_run_job(job) for job in jobs]
+
+
+def _run_job(job):
+    map_path, algorithm, heuristic, seed, h_store = job
+    # Fiecare rulare pornește cu cache-ul de euristică gol, ca o rulare separată de main.py
+    clear_heuristic_cache()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        options = SolverOptions(heuristic=heuristic, seed=seed, h_store=h_store)
+        result = run_solver(algorithm, map_path, options, state=_MAPS[map_path])
+    result["wall_s"] = time.perf_counter() - t0
+    return result
+
+
+def out_file(algorithm, heuristic):
+    if heuristic == "base" and algorithm in OUT_FILES:
+        return OUT_FILES[algorithm]
+    return f"results_{algorithm.replace('*', '')}_{heuristic}.csv"
+
+
+def summarize(name, results):
+    """
+    Un rând CSV pentru o hartă, cu semantica vechilor run_all_*.sh: min / max pe rulările rezolvate
+    (9999 / 9999999 dacă nu e niciuna), mediile împărțite la numărul tuturor rulărilor.
+    """
+    solved = [r for r in results if r["solved"]]
+    runs = len(results)
+    times = [r["time_s"] for r in solved]
+    steps = [r["steps"] for r in solved]
+    pulls = [r["pulls"] for r in solved]
+    return {
+        "Test": name,
+        "solved": len(solved),
+        "not_solved": runs - len(solved),
+        "avg_time_s": f"{sum(times) / runs:.6f}",
+        "min_time_s": f"{min(times):.6f}" if times else 9999,
+        "max_time_s": f"{max(times, default=0.0):.6f}",
+        "avg_steps": sum(steps) // runs,
+        "min_steps": min(steps, default=9999999),
+        "max_steps": max(steps, default=0),
+        "avg_pulls": sum(pulls) // runs,
+        "min_pulls": min(pulls, default=9999999),
+        "max_pulls": max(pulls, default=0),
+        "total_time_s": f"{sum(r['wall_s'] for r in results):.6f}",
+        "stages": stages(results),
+    }
+
+
+def stages(results):
+    """Etapele care au rezolvat harta la solverele în etape (lrta* pe hărțile mari), ex. "gbfs:8 lrta*:2"."""
+    counts = Counter((r["metrics"] or {}).get("stage") for r in results if r["solved"])
+    counts.pop(None, None)
+    return " ".join(f"{stage}:{n}" for stage, n in sorted(counts.items()))
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_batch(map_paths, algorithms, heuristic=None, runs=10, workers=None, push_only=False,
+              h_store=None):
+    maps = {path: load_map(path, allow_pulls=not push_only) for path in map_paths}
+    # Fără --heuristic, fiecare algoritm primește euristica lui implicită (push pentru A* / IDA*)
+    heuristics = {alg: heuristic or default_heuristic(alg) for alg in algorithms}
+    jobs = [(path, alg, heuristics[alg], seed, h_store)
+            for alg in algorithms
+            for path in map_paths
+            for seed in range(runs)]
+    # Cu --h-store, rulările aceleiași hărți scriu același fișier: flush-urile paralele și-ar pierde
+    # una alteia valorile, deci joburile unei hărți rulează în ordine, în același worker
+    if h_store:
+        chains = [[job for job in jobs if job[0] == path] for path in map_paths]
+    else:
+        chains = [[job] for job in jobs]
+
+    grouped = defaultdict(list)
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                             initializer=_init_worker, initargs=(maps,)) as pool:
+        futures = [pool.submit(_run_chain, chain) for chain in chains]
+        for fut in as_completed(futures):
+            for r in fut.result():
+                grouped[(r["algorithm"], r["map"])].append(r)
+                icon = "✅" if r["solved"] else "❌"
+                print(f"  {icon} [{r['algorithm']}] {Path(r['map']).name} seed {r['seed']} | "
+                      f"time: {r['time_s']:.4f}s | steps: {r['steps']} | pulls: {r['pulls']}"
+                      + (f" | ERROR: {r['error']}" if r["error"] else ""))
+
+    for alg in algorithms:
+        rows = [summarize(Path(path).name, grouped[(alg, path)]) for path in map_paths]
+        path = out_file(alg, heuristics[alg])
+        write_csv(path, rows)
+        print(f"✅ Datele {alg} au fost salvate în '{path}'")
+
+    print(f"⏱ Total (wall-clock): {time.perf_counter() - t0:.2f}s pentru {len(jobs)} rulări")
+
+
+def parse_cli():
+    p = argparse.ArgumentParser(description="Sokoban batch runner (paralel)")
+    p.add_argument('--algorithms', nargs='+', default=['lrta*', 'sa'], choices=ALGORITHMS)
+    p.add_argument('--heuristic', choices=list(HEURISTICS), default=None,
+                   help="Implicit push pentru astar / idastar, base pentru restul")
+    p.add_argument('--maps', nargs='+', default=None,
+                   help="Fișiere .yaml (implicit tests/*.yaml)")
+    p.add_argument('--runs', type=int, default=10, help="Rulări (seed-uri 0..N-1) per hartă")
+    p.add_argument('--workers', type=int, default=None, help="Procese (implicit: toate core-urile)")
+    p.add_argument('--push-only', action='store_true',
+                   help="Interzice tragerea cutiilor (deadlock pruning complet)")
+    p.add_argument('--h-store', default=None, metavar='DIR',
+                   help="LRTA* porneste de la valorile h invatate de rularile anterioare; "
+                        "rularile unei harti merg atunci una dupa alta, fiecare o continua pe cea dinainte")
+    return p.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_cli()
+    run_batch(
+        args.maps or sorted(glob.glob('tests/*.yaml')),
+        args.algorithms,
+        args.heuristic,
+        args.runs,
+        args.workers,
+        args.push_only,
+        args.h_store
+    )
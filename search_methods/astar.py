@@ -0,0 +1,248 @@
+"""
+A*, IDA* and greedy best-first solvers for Sokoban
+Complete searches over compact states: A* keeps a binary-heap open list and a best-g table,
+IDA* only the current path plus a small bounded transposition table.
+With weight > 1 A* becomes weighted A* (f = g + w·h), whose solutions are at most w times optimal.
+GreedyBestFirst orders its heap by h alone (or g + w·h) and never queues a state twice.
+"""
+import heapq
+import itertools
+import math
+import time
+
+from search_methods.cache import LRUCache
+from search_methods.heuristics import batch_heuristic
+from search_methods.stats import SolverStats
+from sokoban.trace import Trace
+
+
+def _successors(state, macro):
+    if macro:
+        return [((cell, move), nxt) for cell, move, nxt in state.macro_successors()]
+    return state.successors()
+
+
+def _trace(start, moves, macro):
+    return Trace(start, start.expand_macro(moves) if macro else moves)
+
+
+class AStar:
+    def __init__(self, start_state, heuristic_fn, weight=1.0, macro=False, stats=None):
+        self.start = start_state.to_state()
+        self.h = heuristic_fn
+        self.weight = weight
+        self.macro = macro
+        self.stats = stats or SolverStats()
+        self.max_expansions = 2_000_000
+        self.expanded = 0
+        self.generated = 0
+
+    def solve(self, max_expansions=None):
+        max_expansions = max_expansions or self.max_expansions
+        start = self.start.normalized() if self.macro else self.start
+        h0 = self.h(start)
+        if h0 == math.inf:
+            raise RuntimeError("A*: starea initiala e deadlock")
+
+        tie = itertools.count()
+        open_list = [(self.weight * h0, h0, next(tie), 0, start)]
+        g = {start: 0}
+        parent = {start: None}
+        self.expanded = self.generated = 0
+        stats = self.stats
+        clock = time.perf_counter
+
+        while open_list:
+            _, _, _, g_cur, state = heapq.heappop(open_list)
+            if g_cur > g[state]:
+                continue  # intrare veche, starea a fost gasita apoi pe un drum mai scurt
+
+            if state.is_solved():
+                moves = []
+                while parent[state] is not None:
+                    state, move = parent[state]
+                    moves.append(move)
+                return _trace(self.start, moves[::-1], self.macro)
+
+            self.expanded += 1
+            if self.expanded > max_expansions:
+                raise TimeoutError(f"A*: buget de {max_expansions} expandari epuizat")
+
+            g_next = g_cur + 1
+            t0 = clock()
+            succs = _successors(state, self.macro)
+            stats.expanded(succs, clock() - t0)
+            for move, nxt in succs:
+                if g_next >= g.get(nxt, math.inf):
+                    continue
+                h_next = self.h(nxt)
+                if h_next == math.inf:
+                    stats.deadlock_prunes += 1
+                    continue
+                g[nxt] = g_next
+                parent[nxt] = (state, move)
+                self.generated += 1
+                heapq.heappush(open_list, (g_next + self.weight * h_next, h_next, next(tie), g_next, nxt))
+
+        raise RuntimeError("A*: spatiul de cautare a fost epuizat fara solutie")
+
+
+class GreedyBestFirst:
+    """
+    Greedy best-first search: the open list is ordered by h, or by g + w·h when weight is given.
+    The parent table doubles as the set of seen states, so h is computed once per state (in one
+    batch per expansion) and a state is never queued twice; with a weight this is weighted A*
+    without reopening, fast but with no bound on the solution length.
+    """
+
+    def __init__(self, start_state, heuristic_fn, weight=None, macro=False, stats=None, batch_fn=None):
+        self.start = start_state.to_state()
+        self.h = heuristic_fn
+        self.h_batch = batch_fn or batch_heuristic(heuristic_fn)
+        self.weight = weight
+        self.macro = macro
+        self.stats = stats or SolverStats()
+        self.max_expansions = 2_000_000
+        self.expanded = 0
+        self.generated = 0
+
+    def solve(self, max_expansions=None):
+        max_expansions = max_expansions or self.max_expansions
+        start = self.start.normalized() if self.macro else self.start
+        h0 = self.h(start)
+        if h0 == math.inf:
+            raise RuntimeError("GBFS: starea initiala e deadlock")
+
+        weight = self.weight
+        tie = itertools.count()
+        open_list = [(h0 if weight is None else weight * h0, h0, next(tie), 0, start)]
+        parent = {start: None}
+        self.expanded = self.generated = 0
+        stats = self.stats
+        clock = time.perf_counter
+
+        while open_list:
+            _, _, _, g_cur, state = heapq.heappop(open_list)
+
+            if state.is_solved():
+                moves = []
+                while parent[state] is not None:
+                    state, move = parent[state]
+                    moves.append(move)
+                return _trace(self.start, moves[::-1], self.macro)
+
+            self.expanded += 1
+            if self.expanded > max_expansions:
+                raise TimeoutError(f"GBFS: buget de {max_expansions} expandari epuizat")
+
+            t0 = clock()
+            succs = _successors(state, self.macro)
+            stats.expanded(succs, clock() - t0)
+            fresh = [(move, nxt) for move, nxt in succs if nxt not in parent]
+            g_next = g_cur + 1
+            for (move, nxt), h_next in zip(fresh, self.h_batch([nxt for _, nxt in fresh])):
+                parent[nxt] = (state, move)  # deadlock-urile raman vazute, nu se mai evalueaza
+                if h_next == math.inf:
+                    stats.deadlock_prunes += 1
+                    continue
+                self.generated += 1
+                f_next = h_next if weight is None else g_next + weight * h_next
+                heapq.heappush(open_list, (f_next, h_next, next(tie), g_next, nxt))
+
+        raise RuntimeError("GBFS: spatiul de cautare a fost epuizat fara solutie")
+
+
+class IDAStar:
+    def __init__(self, start_state, heuristic_fn, macro=False, table_size=100_000, stats=None):
+        self.start = start_state.to_state()
+        self.h = heuristic_fn
+        self.macro = macro
+        self.stats = stats or SolverStats()
+        self.table_size = table_size
+        self.max_expansions = 2_000_000
+        self.expanded = 0
+        self.iterations = 0
+        # SuccessorCache optional: iteratiile urmatoare reexpandeaza aceleasi stari de sus
+        self.succ_cache = None
+
+    def _search(self, start, bound, max_expansions):
+        """
+        Depth-first search below bound, iterative so deep paths don't hit the recursion limit.
+        Returns (moves, None) on success or (None, smallest f above bound).
+        """
+        best_g = LRUCache(self.table_size)
+        stats = self.stats
+        clock = time.perf_counter
+
+        def generate(state):
+            t0 = clock()
+            succs = _successors(state, self.macro)
+            stats.expanded(succs, clock() - t0)
+            return [(move, nxt, self.h(nxt)) for move, nxt in succs]
+
+        def expand(state):
+            if self.succ_cache is None:
+                return iter(generate(state))
+            return iter(self.succ_cache.expand(state, generate))
+
+        stack = [(start, 0, expand(start))]
+        on_path = {start}
+        moves = []
+        next_bound = math.inf
+
+        while stack:
+            state, g_cur, succs = stack[-1]
+            advanced = False
+
+            for move, nxt, h_next in succs:
+                if nxt in on_path:
+                    continue
+                if h_next == math.inf:
+                    stats.deadlock_prunes += 1
+                    continue
+                f_next = g_cur + 1 + h_next
+                if f_next > bound:
+                    next_bound = min(next_bound, f_next)
+                    continue
+                if nxt.is_solved():
+                    return moves + [move], None
+                if best_g.get(nxt, math.inf) <= g_cur + 1:
+                    continue
+                best_g.put(nxt, g_cur + 1)
+
+                self.expanded += 1
+                if self.expanded > max_expansions:
+                    raise TimeoutError(f"IDA*: buget de {max_expansions} expandari epuizat")
+
+                stack.append((nxt, g_cur + 1, expand(nxt)))
+                on_path.add(nxt)
+                moves.append(move)
+                advanced = True
+                break
+
+            if not advanced:
+                stack.pop()
+                on_path.discard(state)
+                if stack:
+                    moves.pop()
+
+        return None, next_bound
+
+    def solve(self, max_expansions=None):
+        max_expansions = max_expansions or self.max_expansions
+        start = self.start.normalized() if self.macro else self.start
+        if start.is_solved():
+            return Trace(self.start)
+
+        bound = self.h(start)
+        if bound == math.inf:
+            raise RuntimeError("IDA*: starea initiala e deadlock")
+
+        self.expanded = self.iterations = 0
+        while True:
+            self.iterations += 1
+            moves, bound = self._search(start, bound, max_expansions)
+            if moves is not None:
+                return _trace(self.start, moves, self.macro)
+            if bound == math.inf:
+                raise RuntimeError("IDA*: spatiul de cautare a fost epuizat fara solutie")
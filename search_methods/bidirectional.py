@@ -0,0 +1,171 @@
+"""
+Bidirectional search for Sokoban over box moves.
+A node is a box layout plus the player's region (normalized state, the compact key both sides share).
+The forward frontier grows from the start with pushes (and pulls, if the level allows them);
+the backward frontier grows from every solved layout - boxes on the targets, player in any region -
+by undoing them: a push is undone by a pull and a pull by a push. Both sides drop layouts with a box
+on a dead square, since the forward search can never reach them. The search expands whole layers,
+always on the smaller frontier, and stops at the end of the first layer where the two sides meet.
+"""
+import time
+
+from search_methods.stats import SolverStats
+from sokoban.moves import move_deltas, opposite_moves
+from sokoban.state import State
+from sokoban.trace import Trace
+
+
+def region_states(level, box_cells):
+    """Normalized states with the boxes on box_cells, one for each free region of the player."""
+    occupied = set(box_cells)
+    seen = set()
+    states = []
+    for cell in level.floor_cells:
+        if cell in occupied or cell in seen:
+            continue
+        region = State(level, cell, box_cells).reachable_cells()
+        seen.update(region)
+        states.append(State(level, min(region), box_cells))
+    return states
+
+
+def goal_states(level, box_count):
+    """Normalized solved states: boxes on the targets, the player in each free region."""
+    if box_count != len(level.target_cells):
+        raise ValueError("Bidirectional: cautarea inapoi cere la fel de multe cutii ca tinte")
+    return region_states(level, level.target_cells)
+
+
+def predecessors(state):
+    """
+    Returns (cell, move, previous) for every box move that leads from previous to state,
+    previous normalized; cell and move are the forward macro step (walk to cell, then move).
+    """
+    level = state.level
+    neighbours = level.neighbours
+    box_cells = state.box_cells
+    boxes = set(box_cells)
+    result = {}
+
+    def add(cell, move, player, moved_from, moved_to):
+        previous = State(level, player, [moved_to if c == moved_from else c for c in box_cells])
+        previous = previous.normalized()
+        if previous not in result:
+            result[previous] = (cell, move, previous)
+
+    for cell in state.reachable_cells():
+        for move in move_deltas:
+            ahead = neighbours[move][cell]
+            behind = neighbours[opposite_moves[move]][cell]
+            if behind == -1:
+                continue
+
+            # Undo a push along move: box ahead -> cell, player -> behind
+            if ahead in boxes and behind not in boxes:
+                add(behind, move, behind, ahead, cell)
+
+            # Undo a pull along move: box behind -> one cell further back, player -> behind
+            elif level.allow_pulls and behind in boxes:
+                back = neighbours[opposite_moves[move]][behind]
+                if back != -1 and back not in boxes:
+                    add(behind, move + 4, behind, behind, back)
+
+    return list(result.values())
+
+
+class BidirectionalSearch:
+    def __init__(self, start_state, stats=None):
+        self.start = start_state.to_state()
+        self.level = self.start.level
+        self.stats = stats or SolverStats()
+        self.max_expansions = 2_000_000
+        self.expanded = 0
+        self.meeting = None
+        self.tree_sizes = (0, 0)
+
+    def _alive(self, state):
+        dead = self.level.dead_squares
+        return not any(dead[cell] for cell in state.box_cells)
+
+    def _layer(self, frontier, parents, other, expand):
+        """
+        Expands one whole layer; returns (next frontier, meeting states of this layer).
+        parents[state] = (neighbour towards the root, (cell, move)).
+        """
+        stats = self.stats
+        clock = time.perf_counter
+        next_frontier, meetings = [], []
+
+        for state in frontier:
+            self.expanded += 1
+            if self.expanded > self.max_expansions:
+                raise TimeoutError(f"Bidirectional: buget de {self.max_expansions} expandari epuizat")
+
+            t0 = clock()
+            succs = expand(state)
+            stats.expanded(succs, clock() - t0)
+            for cell, move, nxt in succs:
+                if nxt in parents:
+                    continue
+                if not self._alive(nxt):
+                    stats.deadlock_prunes += 1
+                    continue
+                parents[nxt] = (state, (cell, move))
+                next_frontier.append(nxt)
+                if nxt in other:
+                    meetings.append(nxt)
+
+        return next_frontier, meetings
+
+    def _path(self, meeting, forward, backward):
+        """Macro steps start -> meeting -> solved layout."""
+        steps = []
+        state = meeting
+        while forward[state] is not None:
+            state, step = forward[state]
+            steps.append(step)
+        steps.reverse()
+
+        state = meeting
+        while backward[state] is not None:
+            # Pasul inainte duce din state in vecinul lui din arborele de la tinte
+            state_next, step = backward[state]
+            steps.append(step)
+            state = state_next
+        return steps
+
+    def solve(self, max_expansions=None):
+        if max_expansions:
+            self.max_expansions = max_expansions
+        start = self.start.normalized()
+        if start.is_solved():
+            return Trace(self.start)
+        if not self._alive(start):
+            raise RuntimeError("Bidirectional: starea initiala e deadlock")
+
+        goals = goal_states(self.level, len(start.box_cells))
+        forward = {start: None}
+        backward = {goal: None for goal in goals}
+        forward_frontier, backward_frontier = [start], goals
+        self.expanded = 0
+        self.meeting = None
+
+        meetings = []
+        while not meetings:
+            if not forward_frontier or not backward_frontier:
+                raise RuntimeError("Bidirectional: spatiul de cautare a fost epuizat fara solutie")
+
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meetings = self._layer(
+                    forward_frontier, forward, backward,
+                    lambda state: state.macro_successors())
+            else:
+                backward_frontier, meetings = self._layer(
+                    backward_frontier, backward, forward, predecessors)
+            self.tree_sizes = (len(forward), len(backward))
+
+        # Toate intalnirile din ultimul strat: pastram drumul cel mai scurt
+        paths = [self._path(meeting, forward, backward) for meeting in meetings]
+        best = min(range(len(paths)), key=lambda i: len(paths[i]))
+        self.meeting = meetings[best]
+        return Trace(self.start, self.start.expand_macro(paths[best]))
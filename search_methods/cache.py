@@ -0,0 +1,84 @@
+"""
+Bounded LRU cache used by the heuristics and the solvers.
+"""
+
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Dictionary with a size bound: once full, the least recently used entry is evicted.
+    Keeps hit / miss / eviction counters so runs can report how well the cache works.
+    """
+
+    def __init__(self, maxsize: int = 200_000):
+        if maxsize <= 0:
+            raise ValueError("LRUCache: maxsize trebuie sa fie pozitiv")
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        data = self._data
+        if key in data:
+            data.move_to_end(key)
+        data[key] = value
+        if len(data) > self.maxsize:
+            data.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize: int):
+        if maxsize <= 0:
+            raise ValueError("LRUCache: maxsize trebuie sa fie pozitiv")
+        self.maxsize = maxsize
+        while len(self._data) > maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SuccessorCache(LRUCache):
+    """
+    Transposition cache for node expansion: state -> ((move, successor, h), ...).
+    States are their own key (Zobrist hash + full comparison), so revisiting a state skips
+    move generation and the heuristic. Entries hold their successor states, about 1-2 KB each.
+    """
+
+    def expand(self, state, generate):
+        entry = self.get(state)
+        if entry is None:
+            entry = tuple(generate(state))
+            self.put(state, entry)
+        return entry
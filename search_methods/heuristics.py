@@ -1,9 +1,27 @@
 """
-Heuristics for Sokoban – full code with deadlock detection using internal wall checks.
+Heuristics for Sokoban – full code with deadlock detection using the dead-square table of the level.
 """
 
 import math
-from functools import lru_cache
+import weakref
+from collections import OrderedDict
+
+from search_methods.cache import LRUCache
+from search_methods.matching import Assignment, INF_COST
+from search_methods.pdb import pattern_database
+from sokoban.level import UNREACHABLE
+
+# h(boxes) for every level seen so far, bounded so long runs keep a flat memory profile
+_SUM_CACHE = LRUCache(maxsize=200_000)
+
+def set_heuristic_cache_size(maxsize):
+    _SUM_CACHE.resize(maxsize)
+
+def heuristic_cache_stats():
+    return _SUM_CACHE.stats()
+
+def clear_heuristic_cache():
+    _SUM_CACHE.clear()
 
 def _xy(obj):
     if isinstance(obj, tuple):
@@ -22,38 +40,33 @@ def _manhattan(a, b):
     bx, by = _xy(b)
     return abs(ax - bx) + abs(ay - by)
 
-def _is_wall(state, x, y):
-    if hasattr(state, 'walls'):
-        return (x, y) in state.walls
-    if hasattr(state, 'static_map'):
-        try:
-            return state.static_map[y][x] == '#'
-        except Exception:
-            pass
-    if hasattr(state, 'width') and hasattr(state, 'height'):
-        if x < 0 or y < 0 or x >= state.width or y >= state.height:
+def _is_deadlocked(state):
+    """
+    O(1) per box: looks every box up in the dead-square table of the level.
+    The table follows the move model of the level, with pulls almost no square is dead.
+    """
+    dead = state.level.dead_squares
+    for cell in state.box_cells:
+        if dead[cell]:
             return True
     return False
 
-def _is_corner_deadlock(state, box):
-    x, y = _xy(box)
-    horz = _is_wall(state, x - 1, y) or _is_wall(state, x + 1, y)
-    vert = _is_wall(state, x, y - 1) or _is_wall(state, x, y + 1)
-    return horz and vert and (x, y) not in state.targets
-
 def sum_boxes_min_goal_distance(state):
-    boxes = state.boxes.values() if isinstance(state.boxes, dict) else state.boxes
-    for box in boxes:
-        if _is_corner_deadlock(state, box):
-            return math.inf
-    return _cached_sum(id(state), state)
+    if _is_deadlocked(state):
+        return math.inf
+    # The sum only depends on where the boxes are, so equal box layouts share one entry
+    key = ('greedy', state.level, state.box_cells)
+    total = _SUM_CACHE.get(key)
+    if total is None:
+        total = _greedy_sum(state.level, key[2])
+        _SUM_CACHE.put(key, total)
+    return total
 
-@lru_cache(maxsize=None)
-def _cached_sum(_state_id, state):
-    boxes = state.boxes.values() if isinstance(state.boxes, dict) else state.boxes
-    goals = list(state.targets)
+def _greedy_sum(level, box_cells):
+    goals = list(level.targets)
     total = 0
-    for box in boxes:
+    for cell in box_cells:
+        box = level.coords(cell)
         dists = [_manhattan(box, g) for g in goals]
         idx = min(range(len(dists)), key=dists.__getitem__)
         total += dists[idx]
@@ -68,3 +81,238 @@ def sum_boxes_plus_player(state):
     boxes = state.boxes.values() if isinstance(state.boxes, dict) else state.boxes
     mind = min(_manhattan((px, py), box) for box in boxes)
     return base + mind
+
+class _IncrementalMatcher:
+    """
+    Min-cost box/target matching for one level.
+    Keeps the last few solved assignments: a layout where a single box moved
+    relative to one of them costs one O(n^2) augmentation instead of a full solve.
+    """
+
+    def __init__(self, cost_row, recent=8):
+        self._cost_row = cost_row
+        self.recent = recent
+        self._solved = OrderedDict()
+
+    def __call__(self, box_cells):
+        assignment = None
+        box_set = set(box_cells)
+        for solved in reversed(self._solved.values()):
+            old_set = set(solved.rows)
+            removed = old_set - box_set
+            added = box_set - old_set
+            if len(removed) == 1 and len(added) == 1:
+                cell = added.pop()
+                index = solved.rows.index(removed.pop())
+                assignment = solved.replaced(index, cell, self._cost_row(cell))
+                break
+
+        if assignment is None:
+            assignment = Assignment(box_cells, [self._cost_row(cell) for cell in box_cells])
+
+        self._solved[box_cells] = assignment
+        if len(self._solved) > self.recent:
+            self._solved.popitem(last=False)
+
+        return math.inf if assignment.total >= INF_COST else assignment.total
+
+def _manhattan_row(level):
+    def cost_row(cell):
+        box = level.coords(cell)
+        return [_manhattan(box, target) for target in level.targets]
+    return cost_row
+
+def _push_distance_row(level):
+    def cost_row(cell):
+        return [d if d != UNREACHABLE else INF_COST for d in level.box_distance_row(cell)]
+    return cost_row
+
+_MATCHERS = {
+    'manhattan': weakref.WeakKeyDictionary(),
+    'push': weakref.WeakKeyDictionary(),
+}
+_COST_ROWS = {
+    'manhattan': _manhattan_row,
+    'push': _push_distance_row,
+}
+
+def _matcher(level, distance='manhattan'):
+    matchers = _MATCHERS[distance]
+    matcher = matchers.get(level)
+    if matcher is None:
+        matcher = matchers[level] = _IncrementalMatcher(_COST_ROWS[distance](level))
+    return matcher
+
+def min_matching_distance(state):
+    """
+    Sum of Manhattan distances of the optimal box -> target assignment.
+    Never above the greedy sum; admissible and consistent, since one box move changes it by at most 1.
+    """
+    if _is_deadlocked(state):
+        return math.inf
+    key = ('matching', state.level, state.box_cells)
+    total = _SUM_CACHE.get(key)
+    if total is None:
+        total = _matcher(state.level)(key[2])
+        _SUM_CACHE.put(key, total)
+    return total
+
+def min_matching_push_distance(state):
+    """
+    Optimal box -> target assignment over the real box-travel distances of the level (BFS from each
+    target), so walls are no longer ignored. Still admissible: every box must make at least that many moves.
+    """
+    if _is_deadlocked(state):
+        return math.inf
+    key = ('push', state.level, state.box_cells)
+    total = _SUM_CACHE.get(key)
+    if total is None:
+        total = _matcher(state.level, 'push')(key[2])
+        _SUM_CACHE.put(key, total)
+    return total
+
+def _pdb_cached(state, kind, combine):
+    if _is_deadlocked(state):
+        return math.inf
+    database = pattern_database(state.level)
+    # The pattern size is part of the key: the same layout costs more with bigger patterns
+    key = (kind, database.size, state.level, state.box_cells)
+    total = _SUM_CACHE.get(key)
+    if total is None:
+        # Single boxes only see their nearest target, so the push matching is kept as a floor
+        total = max(combine(database, key[3]), _matcher(state.level, 'push')(key[3]))
+        _SUM_CACHE.put(key, total)
+    return total
+
+def pattern_database_distance(state):
+    """
+    Additive pattern database: the boxes are split into disjoint groups of k boxes (plus single boxes),
+    each group costs its exact box moves from the database and the best split is kept.
+    Never below min_matching_push_distance; admissible, and inf as soon as some k boxes
+    can no longer be solved together.
+    """
+    return _pdb_cached(state, 'pdb', lambda database, box_cells: database.additive(box_cells))
+
+def pattern_database_max(state):
+    """Largest pattern database cost over every k boxes of the layout; weaker than the additive one, cheaper to combine."""
+    return _pdb_cached(state, 'pdb-max', lambda database, box_cells: database.maximum(box_cells))
+
+# ---------------------------------------------------------------------------
+# Batch evaluation: h of every successor of a node in one vectorised pass.
+# NumPy is imported on first use, so solver-only imports stay light.
+
+class _LevelArrays:
+    """NumPy copies of the static tables of one level: dead squares and target coordinates."""
+
+    def __init__(self, level):
+        import numpy as np
+        self.np = np
+        self.width = level.width
+        self.dead = np.frombuffer(bytes(level.dead_squares), dtype=np.uint8).astype(bool)
+        self.tx = np.array([x for x, _ in level.targets], dtype=np.int64)
+        self.ty = np.array([y for _, y in level.targets], dtype=np.int64)
+
+_LEVEL_ARRAYS = weakref.WeakKeyDictionary()
+
+def _level_arrays(level):
+    arrays = _LEVEL_ARRAYS.get(level)
+    if arrays is None:
+        arrays = _LEVEL_ARRAYS[level] = _LevelArrays(level)
+    return arrays
+
+def _batch_greedy_sums(arrays, box_matrix):
+    """
+    Greedy box -> nearest free target sums for a (states, boxes) matrix of box cells.
+    Boxes are taken in the same order and ties go to the first target, as in _greedy_sum.
+    """
+    np = arrays.np
+    bx, by = np.divmod(box_matrix, arrays.width)
+    dists = np.abs(bx[:, :, None] - arrays.tx) + np.abs(by[:, :, None] - arrays.ty)
+    rows = np.arange(len(box_matrix))
+    taken = np.zeros((len(box_matrix), len(arrays.tx)), dtype=bool)
+    totals = np.zeros(len(box_matrix), dtype=np.int64)
+    for box in range(box_matrix.shape[1]):
+        free = np.where(taken, np.iinfo(np.int64).max // 4, dists[:, box, :])
+        best = free.argmin(axis=1)
+        totals += free[rows, best]
+        taken[rows, best] = True
+    return totals
+
+def _batch_cached(states, kind, compute):
+    """
+    Shared skeleton of the batch heuristics: answers what it can from the h cache, then masks
+    the deadlocked misses with one table lookup and hands the rest to compute(arrays, box_matrix).
+    Deadlocks are cached as inf here, the per-state heuristics find them before the cache anyway.
+    """
+    level = states[0].level if states else None
+    values = []
+    misses = []
+    for i, state in enumerate(states):
+        total = _SUM_CACHE.get((kind, level, state.box_cells))
+        if total is None:
+            misses.append(i)
+        values.append(total)
+
+    if misses:
+        arrays = _level_arrays(level)
+        np = arrays.np
+        box_matrix = np.array([states[i].box_cells for i in misses], dtype=np.int64)
+        dead = arrays.dead[box_matrix].any(axis=1)
+        alive = np.flatnonzero(~dead)
+        totals = [math.inf] * len(misses)
+        if len(alive):
+            for j, total in zip(alive.tolist(), compute(arrays, box_matrix[alive])):
+                totals[j] = total
+        for i, total in zip(misses, totals):
+            values[i] = total
+            _SUM_CACHE.put((kind, level, states[i].box_cells), total)
+    return values
+
+def _greedy_batch(states):
+    return _batch_cached(states, 'greedy',
+                         lambda arrays, box_matrix: _batch_greedy_sums(arrays, box_matrix).tolist())
+
+def _greedy_plus_player_batch(states):
+    values = _greedy_batch(states)
+    alive = [i for i, value in enumerate(values) if value != math.inf]
+    if alive:
+        arrays = _level_arrays(states[0].level)
+        np = arrays.np
+        boxes = np.array([states[i].box_cells for i in alive], dtype=np.int64)
+        players = np.array([states[i].player_cell for i in alive], dtype=np.int64)
+        bx, by = np.divmod(boxes, arrays.width)
+        px, py = np.divmod(players, arrays.width)
+        nearest = (np.abs(bx - px[:, None]) + np.abs(by - py[:, None])).min(axis=1).tolist()
+        for i, mind in zip(alive, nearest):
+            values[i] += mind
+    return values
+
+def _matching_batch(kind, distance):
+    def batch(states):
+        def compute(arrays, box_matrix):
+            # The assignment itself stays in Python, the incremental matcher is already O(n^2) per box
+            matcher = _matcher(states[0].level, distance)
+            return [matcher(tuple(row)) for row in box_matrix.tolist()]
+        return _batch_cached(states, kind, compute)
+    return batch
+
+_BATCH_HEURISTICS = {
+    sum_boxes_min_goal_distance: _greedy_batch,
+    sum_boxes_plus_player: _greedy_plus_player_batch,
+    min_matching_distance: _matching_batch('matching', 'manhattan'),
+    min_matching_push_distance: _matching_batch('push', 'push'),
+}
+
+def batch_heuristic(heuristic_fn):
+    """
+    Returns h_batch(states) -> list of h values (math.inf for deadlocks), equal to
+    [heuristic_fn(s) for s in states]. All states must belong to the same level.
+    Heuristics without a vectorised version fall back to one call per state.
+    """
+    while hasattr(heuristic_fn, '__wrapped__'):
+        heuristic_fn = heuristic_fn.__wrapped__
+    batch = _BATCH_HEURISTICS.get(heuristic_fn)
+    if batch is None:
+        def batch(states):
+            return [heuristic_fn(state) for state in states]
+    return batch
@@ -0,0 +1,185 @@
+"""
+On-disk store for the h values LRTA* learns, so later runs on the same level warm-start from them.
+
+One file per (level, heuristic) in a cache directory, named after the level fingerprint.
+Layout (little endian):
+    header  8 bytes magic, u64 entry count, u32 generation
+    keys    u64 × n, sorted – Zobrist key of the state (stable across processes, fixed seed)
+    checks  u32 × n          – independent hash of the state, a Zobrist collision never returns another state's h
+    values  u32 × n          – learned h
+    gens    u32 × n          – generation (save number) in which the entry was last written or read
+The file is memory-mapped on the first lookup and binary-searched in place, nothing is parsed up front.
+Once the store grows past max_entries, the entries with the oldest generation are evicted.
+"""
+
+import bisect
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"LRTAH\x00\x02\x00"
+HEADER = struct.Struct("<8sQI")
+ENTRY_SIZE = 20
+MAX_VALUE = 0xFFFFFFFF
+
+
+def state_check(state):
+    """32-bit hash of (player, boxes), independent of the Zobrist key."""
+    cells = array('I', (state.player_cell, *state.box_cells)).tobytes()
+    return int.from_bytes(hashlib.blake2b(cells, digest_size=4).digest(), "little")
+
+
+class HeuristicStore:
+    """
+    Learned h values of one level and heuristic, shared by every run that points to the same directory.
+    get() reads the memory-mapped file; record() + flush() merge new values and rewrite the file atomically.
+    """
+
+    def __init__(self, directory, level, name, max_entries: int = 1_000_000):
+        if max_entries <= 0:
+            raise ValueError("HeuristicStore: max_entries trebuie sa fie pozitiv")
+        self.directory = directory
+        self.path = os.path.join(directory, f"{level.fingerprint()}-{name}.lrtah")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._pending = {}
+        self._touched = set()
+        self._loaded = False
+        self._file = self._map = None
+        self._count = self._generation = 0
+        self._keys = self._checks = self._values = self._gens = None
+
+    def _load(self):
+        self._loaded = True
+        try:
+            self._file = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # fisier gol
+            self.close()
+            return
+
+        if len(self._map) < HEADER.size:
+            self.close()
+            return
+        magic, count, generation = HEADER.unpack_from(self._map)
+        if magic != MAGIC or len(self._map) != HEADER.size + ENTRY_SIZE * count or sys.byteorder != "little":
+            # Format strain sau fisier trunchiat: il ignoram, flush() il va rescrie
+            self.close()
+            return
+
+        view = memoryview(self._map)
+        keys_end = HEADER.size + 8 * count
+        checks_end = keys_end + 4 * count
+        values_end = checks_end + 4 * count
+        self._count, self._generation = count, generation
+        self._keys = view[HEADER.size:keys_end].cast("Q")
+        self._checks = view[keys_end:checks_end].cast("I")
+        self._values = view[checks_end:values_end].cast("I")
+        self._gens = view[values_end:].cast("I")
+
+    def _find(self, key):
+        if not self._loaded:
+            self._load()
+        if not self._count:
+            return -1
+        i = bisect.bisect_left(self._keys, key)
+        return i if i < self._count and self._keys[i] == key else -1
+
+    def get(self, state, default=None):
+        """Learned h of the state, default if it was never stored."""
+        key, check = state.zhash, state_check(state)
+        pending = self._pending.get(key)
+        if pending is not None and pending[0] == check:
+            return pending[1]
+        i = self._find(key)
+        if i < 0 or self._checks[i] != check:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touched.add(key)
+        return self._values[i]
+
+    def record(self, learned):
+        """Queues {state: h} values (finite ones); they reach the disk on flush()."""
+        for state, value in learned.items():
+            self._pending[state.zhash] = (state_check(state), min(int(value), MAX_VALUE))
+
+    def flush(self):
+        """Merges the queued values into the file, evicting the oldest generations past max_entries."""
+        if not self._pending and not self._touched:
+            return
+        if not self._loaded:
+            self._load()
+
+        generation = self._generation + 1
+        entries = {}
+        for i in range(self._count):
+            key = self._keys[i]
+            gen = generation if key in self._touched else self._gens[i]
+            entries[key] = (self._checks[i], self._values[i], gen)
+        for key, (check, value) in self._pending.items():
+            entries[key] = (check, value, generation)
+
+        if len(entries) > self.max_entries:
+            by_age = sorted(entries, key=lambda k: entries[k][2], reverse=True)
+            self.evictions += len(entries) - self.max_entries
+            entries = {k: entries[k] for k in by_age[:self.max_entries]}
+
+        keys = sorted(entries)
+        checks = [entries[k][0] for k in keys]
+        values = [entries[k][1] for k in keys]
+        gens = [entries[k][2] for k in keys]
+
+        self.close()
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(keys), generation))
+            f.write(struct.pack(f"<{len(keys)}Q", *keys))
+            f.write(struct.pack(f"<{len(keys)}I", *checks))
+            f.write(struct.pack(f"<{len(keys)}I", *values))
+            f.write(struct.pack(f"<{len(keys)}I", *gens))
+        # Inlocuire atomica: un alt proces vede fie fisierul vechi, fie pe cel nou
+        os.replace(tmp_path, self.path)
+
+        self._pending.clear()
+        self._touched.clear()
+        self._loaded = False
+
+    def close(self):
+        for view in (self._keys, self._checks, self._values, self._gens):
+            if view is not None:
+                view.release()
+        self._keys = self._checks = self._values = self._gens = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._count = 0
+
+    def stats(self) -> dict:
+        if not self._loaded:
+            self._load()
+        return {
+            "path": self.path,
+            "entries": self._count,
+            "pending": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self):
+        if not self._loaded:
+            self._load()
+        return self._count
@@ -1,59 +1,190 @@
 """
 LRTA* (Learning Real-Time A*) solver for Sokoban
 Adapted to use internal deadlock pruning, cycle avoidance, and periodic feedback.
+In macro mode a node is a box layout plus the player's reachable region, and a step is one push/pull.
+With a HeuristicStore the learned values survive the process: a run starts from what earlier runs learned.
+converge() repeats trials from the start over the same H table until the solution length settles.
 """
 import math
+import time
+from array import array
+
+from search_methods.heuristics import batch_heuristic
+from search_methods.stats import SolverStats
+from sokoban.trace import Trace
 
 class LRTAStar:
-    def __init__(self, start_state, heuristic_fn):
-        self.start = start_state.copy()
+    def __init__(self, start_state, heuristic_fn, macro=False, stats=None, batch_fn=None, store=None):
+        self.start = start_state.to_state()
         self.h = heuristic_fn
-        self.H = {}              
-        self.max_steps = 1000000 
+        self.h_batch = batch_fn or batch_heuristic(heuristic_fn)
+        self.macro = macro
+        self.stats = stats or SolverStats()
+        self.H = {}
+        self.store = store
+        # SuccessorCache optional: revizitarile nu mai genereaza succesorii si nici h-urile lor
+        self.succ_cache = None
+        self.max_steps = 1000000
+        self.trials = []
+        # steps taken over all trials; with a successor cache this differs from stats.expansions
+        self.steps = 0
 
     @staticmethod
     def _key(state):
-        boxes = (state.boxes.values() if isinstance(state.boxes, dict) else state.boxes)
-        boxes_key = tuple(sorted((b.x, b.y) for b in boxes))
-        player_key = (state.player.x, state.player.y)
-        return boxes_key, player_key
+        # States hash by their incrementally updated Zobrist key and compare
+        # their full configuration on collision, so they are the key themselves
+        return state
+
+    def _successors(self, state):
+        if self.macro:
+            return [((cell, move), nxt) for cell, move, nxt in state.macro_successors()]
+        return state.successors()
+
+    def _learned_lookup(self):
+        """Returns learned(state, h): this run's value, else the stored one, else h."""
+        H = self.H
+        if self.store is None:
+            return H.get
+        store_get = self.store.get
+
+        def learned(state, h):
+            value = H.get(state)
+            return value if value is not None else store_get(state, h)
+        return learned
+
+    def save(self):
+        """Writes the values learned so far to the store (no-op without one)."""
+        if self.store is not None:
+            # inf nu are loc in u32 (si ar inlocui, in finally-ul lui solve, exceptia reala)
+            self.store.record({state: value for state, value in self.H.items() if value < math.inf})
+            self.store.flush()
 
     def solve(self, max_steps=None):
+        try:
+            return self._search(max_steps)
+        finally:
+            # Successful or not, what was learned is kept for the next run
+            self.save()
+
+    def converge(self, max_trials=20, patience=5, time_budget=None, max_steps=None):
+        """
+        Runs trials from the start state, keeping H between them, until the shortest solution
+        has not improved for patience solved trials, max_trials ran or time_budget seconds passed.
+        Every trial is recorded in self.trials; returns the shortest solution found.
+        """
+        clock = time.perf_counter
+        deadline = clock() + time_budget if time_budget else None
+        self.trials = []
+        best, error = None, None
+        stable = 0
+
+        try:
+            for number in range(1, max_trials + 1):
+                if deadline is not None and clock() >= deadline:
+                    break
+
+                h_before = len(self.H)
+                steps_before = self.steps
+                t0 = clock()
+                try:
+                    # Primul trial exploreaza ca solve(); urmatoarele sunt LRTA* clasic, care converge
+                    trace = self._search(max_steps, deadline, converging=number > 1)
+                except (TimeoutError, RuntimeError) as e:
+                    trace, error = None, e
+
+                trial = {
+                    "trial": number,
+                    "solved": trace is not None,
+                    "length": len(trace) if trace is not None else None,
+                    "steps": self.steps - steps_before,
+                    "H_size": len(self.H),
+                    "H_growth": len(self.H) - h_before,
+                    "time_s": clock() - t0,
+                }
+                self.trials.append(trial)
+                print(f"  LRTA*: trial {number}: lungime {trial['length']} | pasi {trial['steps']} | "
+                      f"H {trial['H_size']} (+{trial['H_growth']}) | {trial['time_s']:.2f}s")
+
+                if trace is None:
+                    if isinstance(error, RuntimeError):
+                        break  # blocaj: urmatoarele trial-uri ar face exact la fel
+                    continue
+
+                if best is None or len(trace) < len(best):
+                    best, stable = trace, 0
+                else:
+                    stable += 1
+                if stable >= patience:
+                    break
+        finally:
+            self.save()
+
+        if best is None:
+            raise error or TimeoutError("LRTA*: bugetul de timp s-a epuizat inainte de primul trial")
+        return best
+
+    def _search(self, max_steps=None, deadline=None, converging=False):
+        """
+        One trial from the start state. With converging, successors already visited in this trial
+        are not avoided and H only grows, the textbook update under which repeated trials settle.
+        """
         max_steps = max_steps or self.max_steps or 1_000_000
-        current = self.start
-        path = [current]
+        current = self.start.normalized() if self.macro else self.start
+        # one byte per step; macro steps are (cell, move) pairs until the final expansion
+        moves = [] if self.macro else array('B')
         visited = {self._key(current)}
+        stats = self.stats
+        clock = time.perf_counter
+        h_batch = self.h_batch
+        h_current = self.h(current)
+        learned = self._learned_lookup()
+
+        def expand(state):
+            t0 = clock()
+            succs = self._successors(state)
+            stats.expanded(succs, clock() - t0)
+            # h of every successor in one pass, reused for pruning, f values and the tie-break
+            h_vals = h_batch([s for _, s in succs])
+            return [(m, s, h) for (m, s), h in zip(succs, h_vals)]
 
         for step in range(1, max_steps + 1):
             if step % 5000 == 0:
                 print(f"  LRTA*: pasul {step}/{max_steps}…")
+            if deadline is not None and step % 1024 == 0 and clock() >= deadline:
+                raise TimeoutError(f"LRTA*: bugetul de timp s-a epuizat dupa {step} pasi")
 
             if current.is_solved():
-                return path
+                return Trace(self.start, self.start.expand_macro(moves) if self.macro else moves)
+            self.steps += 1
 
-            all_succs = current.get_neighbours()
-            pruned = [s for s in all_succs if self.h(s) < math.inf]
+            if self.succ_cache is None:
+                all_succs = expand(current)
+            else:
+                all_succs = self.succ_cache.expand(current, expand)
+            pruned = [succ for succ in all_succs if succ[2] < math.inf]
+            stats.deadlock_prunes += len(all_succs) - len(pruned)
             if not pruned:
                 raise RuntimeError("Blocaj: toate succesele sunt deadlock")
 
-            non_visited = [s for s in pruned if self._key(s) not in visited]
-            succs = non_visited if non_visited else pruned
+            if converging:
+                succs = pruned
+            else:
+                non_visited = [succ for succ in pruned if self._key(succ[1]) not in visited]
+                succs = non_visited if non_visited else pruned
 
             curr_k = self._key(current)
-            f_vals = []
-            for s in succs:
-                k = self._key(s)
-                h_s = self.H.get(k, self.h(s))
-                f_vals.append(1 + h_s)
-            self.H[curr_k] = max(self.h(current), min(f_vals))
+            f_vals = [1 + learned(self._key(s), h) for _, s, h in succs]
+            if converging:
+                h_current = learned(curr_k, h_current)
+            self.H[curr_k] = max(h_current, min(f_vals))
 
             f_min = min(f_vals)
             candidates = [i for i, f in enumerate(f_vals) if f == f_min]
-            best_idx = min(candidates, key=lambda i: self.h(succs[i]))
-            next_state = succs[best_idx]
+            best_idx = min(candidates, key=lambda i: succs[i][2])
+            move, next_state, h_current = succs[best_idx]
 
             visited.add(self._key(next_state))
-            path.append(next_state)
+            moves.append(move)
             current = next_state
 
         raise TimeoutError(f"Nu s‑a găsit soluție în {max_steps} pași")
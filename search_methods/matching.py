@@ -0,0 +1,114 @@
+"""
+Min-cost assignment of boxes to targets (Hungarian algorithm, O(n^3)) with O(n^2) incremental updates.
+"""
+
+import math
+
+# Cost of a box that can't reach a target, kept finite so the potentials stay well defined
+INF_COST = 10 ** 6
+
+
+class Assignment:
+    """
+    Optimal assignment of rows (boxes) to columns (targets) together with its dual potentials.
+
+    cost[i][j] is the cost of sending row i to column j, there are at least as many columns as rows.
+    u / v are the row / column potentials, p[j] is the row (1-based) matched to column j, 0 if free.
+    """
+
+    __slots__ = ("rows", "cost", "u", "v", "p", "total")
+
+    def __init__(self, rows, cost, _solve=True):
+        self.rows = list(rows)
+        self.cost = [list(row) for row in cost]
+        n = len(self.cost)
+        m = len(self.cost[0]) if n else 0
+        self.u = [0] * (n + 1)
+        self.v = [0] * (m + 1)
+        self.p = [0] * (m + 1)
+        self.total = 0
+        if _solve:
+            for i in range(1, n + 1):
+                self._augment(i)
+            self._update_total()
+
+    def _augment(self, i):
+        """
+        Adds row i to the matching along a shortest augmenting path (Dijkstra on reduced costs).
+        Needs feasible potentials (u[r] + v[c] <= cost[r][c]) and tight matched edges.
+        """
+        cost, u, v, p = self.cost, self.u, self.v, self.p
+        m = len(v) - 1
+        p[0] = i
+        j0 = 0
+        minv = [math.inf] * (m + 1)
+        way = [0] * (m + 1)
+        used = [False] * (m + 1)
+
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = cost[i0 - 1]
+            u_i0 = u[i0]
+            delta = math.inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - u_i0 - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+
+        while True:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+            if j0 == 0:
+                break
+
+    def _update_total(self):
+        cost, p = self.cost, self.p
+        self.total = sum(cost[p[j] - 1][j - 1] for j in range(1, len(p)) if p[j])
+
+    def replaced(self, index, row_key, cost_row):
+        """
+        Returns the optimal assignment after row `index` changed to `row_key` with costs `cost_row`.
+        For a square problem only that row is re-augmented; rectangular ones are re-solved.
+        """
+        rows = self.rows.copy()
+        rows[index] = row_key
+        cost = [row.copy() for row in self.cost]
+        cost[index] = list(cost_row)
+
+        n, m = len(cost), len(self.v) - 1
+        if n != m:
+            return Assignment(rows, cost)
+
+        new = Assignment(rows, cost, _solve=False)
+        new.u = self.u.copy()
+        new.v = self.v.copy()
+        new.p = self.p.copy()
+
+        i = index + 1
+        for j in range(1, m + 1):
+            if new.p[j] == i:
+                new.p[j] = 0
+
+        # Lowest potential that keeps every reduced cost of the row non-negative
+        v = new.v
+        new.u[i] = min(cost_row[j - 1] - v[j] for j in range(1, m + 1))
+        new._augment(i)
+        new._update_total()
+        return new
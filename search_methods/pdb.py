@@ -0,0 +1,238 @@
+"""
+Pattern databases for Sokoban: exact box-move costs of small box subsets, as heuristic building blocks.
+
+For a level and a pattern size k (2 or 3) the database holds, for every set of k boxes on live
+(non-dead) cells, the fewest box moves that put those boxes on any k targets, the other boxes
+removed and the player anywhere. It is built by retrograde BFS: from every k-subset of the targets
+(player in each region) backwards with bidirectional.predecessors, so it follows the move model
+of the level. Layouts that can never be solved keep the INF byte, which catches multi-box deadlocks.
+
+File layout (little endian), one file per (level fingerprint, k) in a cache directory:
+    header  8 bytes magic, u16 k, u16 live cell count n, u32 entry count C(n, k)
+    cells   u16 × n – live cells, in increasing order
+    table   u8 × C(n, k) – cost of the subset of rank r (combinatorial number system), INF = 255
+The file is memory-mapped, nothing is parsed beyond the header and the cell list.
+"""
+
+import itertools
+import math
+import mmap
+import os
+import struct
+import weakref
+from array import array
+
+from search_methods.bidirectional import predecessors, region_states
+
+MAGIC = b"SOKPDB\x00\x01"
+HEADER = struct.Struct("<8sHHI")
+INF = 255
+SIZES = (2, 3)
+
+# Directorul cache-ului si marimea tiparelor, setate o data de main (--pdb-dir / --pdb-size)
+_CONFIG = {"directory": None, "size": 2}
+_DATABASES = weakref.WeakKeyDictionary()
+
+
+def configure(directory=None, size=2):
+    """Where databases are cached (None = built in memory only) and the pattern size used by the heuristics."""
+    if size not in SIZES:
+        raise ValueError(f"PDB: marimea tiparului trebuie sa fie una din {SIZES}")
+    _CONFIG["directory"] = directory
+    _CONFIG["size"] = size
+
+
+def pattern_database(level, size=None):
+    """Database of the level for the pattern size (the configured one by default): loaded, or built once."""
+    size = size or _CONFIG["size"]
+    per_level = _DATABASES.setdefault(level, {})
+    database = per_level.get(size)
+    if database is None:
+        database = per_level[size] = PatternDatabase.load_or_build(level, size, _CONFIG["directory"])
+    return database
+
+
+class PatternDatabase:
+    """
+    Costs of every k-subset of the live cells of one level.
+    value() looks one subset up; additive() and maximum() turn a whole box layout into an h value.
+    """
+
+    def __init__(self, level, size, live, table, path=None):
+        self.level = level
+        self.size = size
+        self.live = live
+        self.path = path
+        self._table = table
+        self._map = self._file = None
+        self._index = array('h', [-1]) * level.size
+        for i, cell in enumerate(live):
+            self._index[cell] = i
+        # _binom[j][a] = C(a, j + 1), the weight of index a at position j of a sorted subset
+        self._binom = [[math.comb(a, j + 1) for a in range(len(live))] for j in range(size)]
+        self._single = level._box_distances_to(level.target_cells)
+
+    @staticmethod
+    def live_cells(level):
+        return [cell for cell in sorted(level.floor_cells) if not level.dead_squares[cell]]
+
+    @classmethod
+    def file_path(cls, directory, level, size):
+        return os.path.join(directory, f"{level.fingerprint()}-pdb{size}.bin")
+
+    @classmethod
+    def load_or_build(cls, level, size, directory=None):
+        """Maps the cached file when it matches the level, otherwise builds (and caches, with a directory)."""
+        if directory is None:
+            return cls.build(level, size)
+        path = cls.file_path(directory, level, size)
+        database = cls.load(path, level, size)
+        if database is None:
+            database = cls.build(level, size)
+            database.save(path)
+        return database
+
+    @classmethod
+    def build(cls, level, size):
+        """Retrograde BFS from the solved k-box layouts; the first layer reaching a layout is its cost."""
+        live = cls.live_cells(level)
+        database = cls(level, size, live, bytearray([INF]) * math.comb(len(live), size))
+        if len(level.target_cells) < size:
+            return database
+
+        table = database._table
+        layer = []
+        seen = set()
+        for boxes in itertools.combinations(sorted(level.target_cells), size):
+            for state in region_states(level, boxes):
+                seen.add(state)
+                layer.append(state)
+
+        depth = 0
+        while layer:
+            next_layer = []
+            for state in layer:
+                rank = database._rank(state.box_cells)
+                if rank < 0:
+                    continue
+                if table[rank] == INF:
+                    table[rank] = min(depth, INF - 1)
+                for _, _, previous in predecessors(state):
+                    if previous not in seen:
+                        seen.add(previous)
+                        next_layer.append(previous)
+            layer = next_layer
+            depth += 1
+
+        database._table = bytes(table)
+        return database
+
+    @classmethod
+    def load(cls, path, level, size):
+        """The memory-mapped database at path, or None if it is missing or was built for something else."""
+        try:
+            file = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # fisier gol
+            file.close()
+            return None
+
+        live = cls.live_cells(level)
+        cells_end = HEADER.size + 2 * len(live)
+        count = math.comb(len(live), size)
+        valid = (len(mapped) == cells_end + count
+                 and HEADER.unpack_from(mapped) == (MAGIC, size, len(live), count)
+                 and list(struct.unpack_from(f"<{len(live)}H", mapped, HEADER.size)) == live)
+        if not valid:
+            # Fisier strain sau trunchiat: se reconstruieste si se rescrie
+            mapped.close()
+            file.close()
+            return None
+
+        database = cls(level, size, live, memoryview(mapped)[cells_end:], path)
+        database._map, database._file = mapped, file
+        return database
+
+    def save(self, path):
+        """Writes the database atomically: a concurrent reader sees either no file or the whole file."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.size, len(self.live), len(self._table)))
+            f.write(struct.pack(f"<{len(self.live)}H", *self.live))
+            f.write(self._table)
+        os.replace(tmp_path, path)
+        self.path = path
+
+    def close(self):
+        if self._map is not None:
+            self._table.release()
+            self._table = b""
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+    def _rank(self, cells):
+        """Rank of a sorted tuple of k cells, -1 if one of them is dead."""
+        rank = 0
+        index = self._index
+        for j, cell in enumerate(cells):
+            i = index[cell]
+            if i < 0:
+                return -1
+            rank += self._binom[j][i]
+        return rank
+
+    def value(self, cells):
+        """Fewest box moves that put the boxes on cells (sorted, k of them) on targets; inf if impossible."""
+        rank = self._rank(cells)
+        if rank < 0:
+            return math.inf
+        value = self._table[rank]
+        return math.inf if value == INF else value
+
+    def single(self, cell):
+        distance = self._single[cell]
+        return math.inf if distance == 0xFFFF else distance
+
+    def maximum(self, box_cells):
+        """Largest cost of any k boxes of the layout (box_cells sorted)."""
+        if len(box_cells) < self.size:
+            return max((self.single(cell) for cell in box_cells), default=0)
+        return max(self.value(cells) for cells in itertools.combinations(box_cells, self.size))
+
+    def additive(self, box_cells):
+        """
+        Best split of the boxes into disjoint groups of k boxes and single boxes, each group costed
+        on its own; the groups move different boxes, so the sum stays a lower bound.
+        """
+        n = len(box_cells)
+        size = self.size
+        best = {0: 0}
+
+        def solve(mask):
+            value = best.get(mask)
+            if value is not None:
+                return value
+            first = (mask & -mask).bit_length() - 1
+            rest = mask & ~(1 << first)
+            value = self.single(box_cells[first]) + solve(rest)
+            others = [i for i in range(first + 1, n) if rest >> i & 1]
+            for group in itertools.combinations(others, size - 1):
+                cells = (box_cells[first], *(box_cells[i] for i in group))
+                remaining = rest
+                for i in group:
+                    remaining &= ~(1 << i)
+                value = max(value, self.value(cells) + solve(remaining))
+            best[mask] = value
+            return value
+
+        return solve((1 << n) - 1)
+
+    def __len__(self):
+        return len(self._table)
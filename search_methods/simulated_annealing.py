@@ -1,55 +1,163 @@
 """
-Simulated Annealing pt Sokoban
+Simulated Annealing pt Sokoban – incremental engine.
+One mutable board (player cell + box occupancy) is changed in place: every iteration picks one random
+legal move, applies it with an undo record and gets delta from the single box that moved,
+since the energy is a sum of per-box costs. A rejected move is undone from the record, nothing is copied.
 """
 
-import math, random
-from copy import deepcopy
+import math
+import random
+from array import array
+
+from sokoban.level import UNREACHABLE
+from sokoban.moves import BOX_LEFT, opposite_moves
+from sokoban.trace import Trace
+
+
+def nearest_target_costs(level, push=False):
+    """
+    Per-cell cost of a box: distance to the nearest target, inf on dead squares.
+    Manhattan by default, box moves over the real level (BFS from the targets) with push=True.
+    """
+    if push:
+        distances = level._box_distances_to(level.target_cells)
+        return [math.inf if d == UNREACHABLE else d for d in distances]
+
+    costs = [math.inf] * level.size
+    for cell in level.floor_cells:
+        if not level.dead_squares[cell]:
+            x, y = level.coords(cell)
+            costs[cell] = min(abs(x - tx) + abs(y - ty) for tx, ty in level.targets)
+    return costs
+
 
 class SimulatedAnnealing:
-    def __init__(self, map_obj, heuristic_fn,
-                 T0=1000.0, alpha=0.995, min_T=1e-3,
-                 max_steps=200_000, seed=0):
-        self.initial_map = map_obj.copy()
-        self.h = heuristic_fn
+    def __init__(self, start_state, box_cost=None, T0=2000.0, alpha=0.999, min_T=1e-4,
+                 max_steps=500_000, seed=0, rng=None):
+        self.start = start_state.to_state()
+        self.level = self.start.level
+        self.box_cost = box_cost or nearest_target_costs(self.level)
         self.T0, self.alpha, self.min_T = T0, alpha, min_T
         self.max_steps = max_steps
-        random.seed(seed)
+        self.rng = rng or random.Random(seed)
+        self.steps = 0
+        self.accepted = 0
+        self.deadlock_prunes = 0
+        self._reset()
+
+    def _reset(self):
+        level = self.level
+        self.player = self.start.player_cell
+        self.occupied = bytearray(level.size)
+        for cell in self.start.box_cells:
+            self.occupied[cell] = 1
+        self.covered = sum(self.occupied[cell] for cell in level.target_cells)
+        self.energy = sum(self.box_cost[cell] for cell in self.start.box_cells)
+
+    def is_solved(self):
+        return self.covered == len(self.level.target_cells)
+
+    def legal_moves(self):
+        """Moves of the current board, in the same order as State.successors()."""
+        neighbours = self.level.neighbours
+        occupied = self.occupied
+        player = self.player
+        moves, box_moves = [], []
 
-    def _random_action(self, state):
-        acts = state.legal_actions()
-        return random.choice(acts) if acts else None
+        for move, table in neighbours.items():
+            future = table[player]
+            if future == -1:
+                continue
+            if occupied[future]:
+                # Walking into a box pushes it, with or without the BOX_* code
+                beyond = table[future]
+                if beyond != -1 and not occupied[beyond]:
+                    moves.append(move)
+                    box_moves.append(move + 4)
+            else:
+                moves.append(move)
+                if self.level.allow_pulls:
+                    behind = neighbours[opposite_moves[move]][player]
+                    if behind != -1 and occupied[behind]:
+                        box_moves.append(move + 4)
 
-    def _neighbour(self, state):
-        action = self._random_action(state)
-        if action is None:
-            return None, None
-        new_state = state.apply(action)
-        return new_state, action
+        moves.extend(box_moves)
+        return moves
+
+    def apply(self, move):
+        """
+        Applies a legal move in place and returns its undo record
+        (previous player cell, box cell before, box cell after, previous energy),
+        the box cells are -1 for a plain walk.
+        """
+        neighbours = self.level.neighbours
+        direction = move - 4 if move >= BOX_LEFT else move
+        table = neighbours[direction]
+        player = self.player
+        future = table[player]
+
+        if self.occupied[future]:
+            moved_from, moved_to = future, table[future]
+        elif move >= BOX_LEFT:
+            # Player drags the box behind him // e.g. _ P B => P B _
+            moved_from, moved_to = neighbours[opposite_moves[direction]][player], player
+        else:
+            moved_from = moved_to = -1
+
+        energy = self.energy
+        self.player = future
+        if moved_from != -1:
+            self._move_box(moved_from, moved_to)
+        return player, moved_from, moved_to, energy
+
+    def undo(self, record):
+        """Rolls back the move of an undo record."""
+        player, moved_from, moved_to, energy = record
+        self.player = player
+        if moved_from != -1:
+            self._move_box(moved_to, moved_from)
+        # Restored, not recomputed: inf - inf would leave NaN after a move onto a dead square
+        self.energy = energy
+
+    def _move_box(self, source, dest):
+        occupied, target_set = self.occupied, self.level.target_set
+        occupied[source] = 0
+        occupied[dest] = 1
+        self.covered += (dest in target_set) - (source in target_set)
+        self.energy += self.box_cost[dest] - self.box_cost[source]
 
     def solve(self):
-        current = self.initial_map
-        best = current
-        best_cost = self.h(current)
-        T = self.T0
-        trajectory = []         
-
-        for step in range(self.max_steps):
-            if current.is_goal():
-                return trajectory
-
-            neighbour, action = self._neighbour(current)
-            if neighbour is None:
-                break        
-
-            delta = self.h(neighbour) - self.h(current)
-            if delta < 0 or random.random() < math.exp(-delta / T):
-                current = neighbour
-                trajectory.append(action)
-                if self.h(current) < best_cost:
-                    best, best_cost = current, self.h(current)
+        """One annealing run from the start; returns the Trace of the accepted moves."""
+        self._reset()
+        if self.energy == math.inf:
+            raise RuntimeError("SA: starea initiala e deadlock")
+
+        box_cost, rng = self.box_cost, self.rng
+        moves = array('B')
+        T, steps = self.T0, 0
+
+        while T > self.min_T and steps < self.max_steps:
+            if self.is_solved():
+                break
+            legal = self.legal_moves()
+            if not legal:
+                break
+            move = legal[rng.randrange(len(legal))]
+            record = self.apply(move)
+
+            _, moved_from, moved_to, _ = record
+            delta = box_cost[moved_to] - box_cost[moved_from] if moved_from != -1 else 0
+            if delta == math.inf:
+                self.undo(record)
+                self.deadlock_prunes += 1
+            elif delta < 0 or math.exp(-delta / T) > rng.random():
+                moves.append(move)
+                self.accepted += 1
+            else:
+                self.undo(record)
 
             T *= self.alpha
-            if T < self.min_T:
-                T = self.T0      
+            steps += 1
 
-        return trajectory 
+        self.steps = steps
+        return Trace(self.start, moves)
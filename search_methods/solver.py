@@ -1,196 +1,856 @@
-# search_methods/solver.py
-"""
-solver.py – Adaptiv: LRTA*, Greedy (cu buget), Simulated Annealing (multi-restart)
-"""
-
-from abc import ABC, abstractmethod
-import random
-import math
-import itertools
-
-from search_methods.lrta_star import LRTAStar
-from search_methods.heuristics import (
-    sum_boxes_min_goal_distance,
-    sum_boxes_plus_player
-)
-
-
-class Solver(ABC):
-    def __init__(self, map_obj, heuristic_fn):
-        self.map = map_obj
-        self.heuristic = heuristic_fn
-
-    @abstractmethod
-    def solve(self):
-        ...
-
-
-class LrtaStarSolver(Solver):
-    def __init__(self, map_obj, heuristic_fn, max_steps: int = 500_000):
-        super().__init__(map_obj, heuristic_fn)
-        self._solver = LRTAStar(self.map, self.heuristic)
-        self._solver.max_steps = max_steps
-
-    def solve(self):
-        return self._solver.solve()
-
-
-class GreedySolver(Solver):
-    def __init__(self, map_obj, heuristic_fn):
-        super().__init__(map_obj, heuristic_fn)
-        self.last_steps = 0
-
-    def solve(self, max_steps: int | None = None):
-        cur = self.map.copy()
-        path = [cur]
-        for step in itertools.count(1):
-            if max_steps and step > max_steps:
-                raise TimeoutError("GreedySolver: buget epuizat")
-            if cur.is_solved():
-                self.last_steps = step - 1
-                return path
-            succs = [s for s in cur.get_neighbours()
-                     if self.heuristic(s) < float('inf')]
-            if not succs:
-                raise RuntimeError("GreedySolver: dead-end")
-            cur = min(succs, key=self.heuristic)
-            path.append(cur)
-
-
-class SimulatedAnnealingSolver(Solver):
-    def __init__(
-        self,
-        map_obj,
-        heuristic_fn,
-        T0: float = 2000.0,
-        alpha: float = 0.999,
-        min_T: float = 1e-4,
-        max_steps: int = 500_000,
-        restarts: int = 5,
-        seed: int = 0
-    ):
-        super().__init__(map_obj, heuristic_fn)
-        self.T0 = T0
-        self.alpha = alpha
-        self.min_T = min_T
-        self.max_steps = max_steps
-        self.restarts = restarts
-        self.seed = seed
-        self.last_steps = 0
-
-    def solve(self):
-        best_path = []
-        best_len = -1
-        best_steps = 0
-
-        for r in range(self.restarts):
-            random.seed(self.seed + r)
-            cur = self.map.copy()
-            path = [cur]
-            T = self.T0
-            steps = 0
-
-            while T > self.min_T and steps < self.max_steps:
-                if cur.is_solved():
-                    self.last_steps = steps
-                    return path
-                neigh = random.choice(cur.get_neighbours())
-                if self.heuristic(neigh) == float('inf'):
-                    steps += 1
-                    T *= self.alpha
-                    continue
-                delta = self.heuristic(neigh) - self.heuristic(cur)
-                if delta < 0 or math.exp(-delta / T) > random.random():
-                    cur = neigh
-                    path.append(cur)
-                T *= self.alpha
-                steps += 1
-
-            if len(path) > best_len:
-                best_len = len(path)
-                best_path = path
-                best_steps = steps
-
-        self.last_steps = best_steps
-        return best_path
-
-
-class AdaptiveSolver(Solver):
-    def __init__(
-        self,
-        map_obj,
-        heuristic_fn,
-        greedy_budget: int = 4000,
-        lrta_budget: int = 300_000
-    ):
-        super().__init__(map_obj, heuristic_fn)
-        self.greedy_budget = greedy_budget
-        self.lrta_budget = lrta_budget
-
-    def solve(self):
-        try:
-            gs = GreedySolver(self.map, self.heuristic)
-            states = gs.solve(max_steps=self.greedy_budget)
-            print(f"  AdaptiveSolver: solved greedy in {gs.last_steps} pasi")
-            return states
-        except TimeoutError:
-            print("  AdaptiveSolver: buget greedy epuizat, trec la LRTA*")
-        except Exception:
-            print("  AdaptiveSolver: greedy a esuat, trec la LRTA*")
-
-        try:
-            lrta = LrtaStarSolver(self.map, self.heuristic, max_steps=self.lrta_budget)
-            states = lrta.solve()
-            print(f"  AdaptiveSolver: solved LRTA* în {len(states)-1} pasi")
-            return states
-        except TimeoutError:
-            print("  AdaptiveSolver: LRTA* timeout, trec la SA")
-
-        sa = SimulatedAnnealingSolver(
-            self.map,
-            self.heuristic,
-            T0=2000.0,
-            alpha=0.999,
-            min_T=1e-4,
-            max_steps=500_000,
-            restarts=5,
-            seed=0
-        )
-        states = sa.solve()
-        print(f"  AdaptiveSolver: fallback SA dupa {sa.last_steps} iteratii")
-        return states
-
-
-def get_solver(
-    algorithm: str,
-    map_obj,
-    heuristic_type: str = 'base',
-    max_steps: int | None = None
-):
-    heur_fn = (
-        sum_boxes_min_goal_distance
-        if heuristic_type == 'base'
-        else sum_boxes_plus_player
-    )
-
-    if algorithm == 'lrta*':
-        if max_steps and max_steps > 200_000:
-            return AdaptiveSolver(map_obj, heur_fn,
-                                  greedy_budget=4000,
-                                  lrta_budget=max_steps)
-        return LrtaStarSolver(map_obj, heur_fn, max_steps or 500_000)
-
-    if algorithm == 'sa':
-        ms = max_steps or 500_000
-        return SimulatedAnnealingSolver(
-            map_obj,
-            heur_fn,
-            T0=2000.0,
-            alpha=0.999,
-            min_T=1e-4,
-            max_steps=ms,
-            restarts=5,
-            seed=0
-        )
-
-    raise ValueError(f"Unknown algorithm: {algorithm}")
+# search_methods/solver.py
+"""
+solver.py – Adaptiv: GBFS / Greedy (cu buget), LRTA*, Simulated Annealing (multi-restart), A* / IDA* (complete),
+            Bidirectional (push-uri de la start, pull-uri de la tinte, pe mutari de cutii),
+            Portfolio (aceleasi metode in paralel, castiga prima solutie verificata)
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+import contextlib
+import io
+import random
+import math
+import itertools
+import time
+from array import array
+
+from search_methods.lrta_star import LRTAStar
+from search_methods.astar import AStar, GreedyBestFirst, IDAStar
+from search_methods.bidirectional import BidirectionalSearch
+from search_methods.cache import SuccessorCache
+from search_methods.hstore import HeuristicStore
+from search_methods.pdb import configure as configure_pattern_databases
+from search_methods.simulated_annealing import SimulatedAnnealing, nearest_target_costs
+from search_methods.stats import SolverStats, profile_call
+from sokoban.state import State
+from sokoban.trace import Trace
+from search_methods.heuristics import (
+    batch_heuristic,
+    heuristic_cache_stats,
+    sum_boxes_min_goal_distance,
+    sum_boxes_plus_player,
+    min_matching_distance,
+    min_matching_push_distance,
+    pattern_database_distance,
+    pattern_database_max
+)
+
+HEURISTICS = {
+    'base': sum_boxes_min_goal_distance,
+    'enhanced': sum_boxes_plus_player,
+    'matching': min_matching_distance,
+    'push': min_matching_push_distance,
+    'pdb': pattern_database_distance,
+    'pdb-max': pattern_database_max,
+}
+
+MOVE_GENERATORS = ('tables', 'bitboard')
+
+# Algoritmii pe care ii stie get_solver (si CLI-urile main / run_all)
+ALGORITHMS = ('lrta*', 'sa', 'astar', 'idastar', 'gbfs', 'bidir', 'portfolio')
+
+# Euristicile care nu supraestimeaza costul: doar cu ele solutiile A* / IDA* sunt optime
+# (base si enhanced atribuie cutiile greedy, iar enhanced mai adauga si distanta jucatorului)
+ADMISSIBLE_HEURISTICS = ('matching', 'push', 'pdb', 'pdb-max')
+OPTIMAL_ALGORITHMS = ('astar', 'idastar')
+
+
+def default_heuristic(algorithm: str) -> str:
+    """Euristica folosita cand nu e aleasa una: admisibila pentru A* / IDA*, base in rest."""
+    return 'push' if algorithm in OPTIMAL_ALGORITHMS else 'base'
+
+
+@dataclass(frozen=True)
+class SolverOptions:
+    """
+    Optiunile unui solver, de la CLI pana la get_solver (si in procesele portofoliului).
+    Fiecare algoritm le citeste doar pe ale lui; valorile implicite sunt cele ale CLI-ului.
+    """
+    # None = default_heuristic(algoritm)
+    heuristic: str | None = None
+    max_steps: int | None = None
+    macro: bool = False
+    # A* ponderat (implicit 1) sau, la gbfs, prioritatea g + w·h in loc de h
+    weight: float | None = None
+    seed: int = 0
+    movegen: str = 'tables'
+    # LRTA*: valorile invatate pe disc, trial-uri repetate
+    h_store: str | None = None
+    h_store_size: int = 1_000_000
+    trials: int = 1
+    time_budget: float | None = None
+    # SA
+    sa_workers: int = 1
+    sa_exchange: int | None = None
+    sa_incremental: bool = False
+    # SuccessorCache (LRU) pt LRTA*, SA si IDA*
+    succ_cache_size: int | None = None
+    # Bazele de tipare ale euristicilor pdb / pdb-max
+    pdb_dir: str | None = None
+    pdb_size: int = 2
+
+
+class Solver(ABC):
+    def __init__(self, map_obj, heuristic_fn, stats: SolverStats | None = None):
+        self.map = map_obj
+        # Toate apelurile euristicii trec prin contor; sub-solverele (Adaptive) primesc acelasi stats
+        self.stats = stats or SolverStats()
+        self.heuristic = self.stats.counting(heuristic_fn)
+        # h pentru toti succesorii unui nod dintr-o singura trecere vectorizata
+        self.heuristic_batch = self.stats.counting_batch(batch_heuristic(heuristic_fn))
+        self.profile_report = None
+        # Cache de transpozitii (stare -> succesori + h), optional; vezi use_successor_cache
+        self.succ_cache = None
+
+    @abstractmethod
+    def solve(self):
+        ...
+
+    def run(self, profile: bool = False, profile_path: str | None = None):
+        """
+        solve() plus timpul total si hit-urile cache-ului de euristici in self.stats.
+        Cu profile=True ruleaza sub cProfile: topul functiilor ajunge in self.profile_report,
+        iar profilul brut in profile_path (daca e dat).
+        """
+        before = heuristic_cache_stats()
+        t0 = time.perf_counter()
+        try:
+            if profile or profile_path:
+                trace, self.profile_report = profile_call(self.solve, profile_path)
+            else:
+                trace = self.solve()
+        finally:
+            self.stats.total_time += time.perf_counter() - t0
+            after = heuristic_cache_stats()
+            self.stats.cache_hits += after['hits'] - before['hits']
+            self.stats.cache_misses += after['misses'] - before['misses']
+        return trace
+
+    def use_successor_cache(self, cache: SuccessorCache | None):
+        """Bucla solverului isi ia succesorii (si h-urile lor) din cache; None = fara cache."""
+        self.succ_cache = cache
+
+    def _expand(self, state):
+        """(mutare, succesor, h) pt fiecare succesor al starii, din cache daca e folosit."""
+        if self.succ_cache is None:
+            return self._generate(state)
+        return self.succ_cache.expand(state, self._generate)
+
+    def _generate(self, state):
+        t0 = time.perf_counter()
+        succs = state.successors()
+        self.stats.expanded(succs, time.perf_counter() - t0)
+        h_vals = self.heuristic_batch([s for _, s in succs])
+        return [(m, s, h) for (m, s), h in zip(succs, h_vals)]
+
+    def metrics(self) -> dict:
+        """Contoarele din stats plus metricile specifice fiecarui algoritm."""
+        metrics = self.stats.to_dict()
+        if self.succ_cache is not None:
+            metrics["succ_cache"] = self.succ_cache.stats()
+        return metrics
+
+
+class LrtaStarSolver(Solver):
+    def __init__(
+        self,
+        map_obj,
+        heuristic_fn,
+        max_steps: int = 500_000,
+        macro: bool = False,
+        stats: SolverStats | None = None,
+        store_dir: str | None = None,
+        store_size: int = 1_000_000,
+        trials: int = 1,
+        time_budget: float | None = None,
+        patience: int = 5
+    ):
+        super().__init__(map_obj, heuristic_fn, stats)
+        self.trials = trials
+        self.time_budget = time_budget
+        self.patience = patience
+        # Valorile invatate se pastreaza pe disc per (nivel, euristica, mod), daca store_dir e dat
+        store = None
+        if store_dir:
+            name = self.heuristic.__name__ + ("-macro" if macro else "")
+            store = HeuristicStore(store_dir, self.map.level, name, max_entries=store_size)
+        self._solver = LRTAStar(self.map, self.heuristic, macro=macro, stats=self.stats,
+                                batch_fn=self.heuristic_batch, store=store)
+        self._solver.max_steps = max_steps
+
+    def use_successor_cache(self, cache: SuccessorCache | None):
+        super().use_successor_cache(cache)
+        self._solver.succ_cache = cache
+
+    def solve(self):
+        # Mod convergenta: trial-uri repetate peste acelasi H, pana se stabilizeaza lungimea
+        if self.trials > 1 or self.time_budget:
+            return self._solver.converge(max_trials=self.trials, patience=self.patience,
+                                         time_budget=self.time_budget)
+        return self._solver.solve()
+
+    def metrics(self) -> dict:
+        metrics = {**super().metrics(), "H_size": len(self._solver.H)}
+        if self._solver.trials:
+            metrics["trials"] = self._solver.trials
+        if self._solver.store is not None:
+            metrics["H_store"] = self._solver.store.stats()
+        return metrics
+
+
+class AStarSolver(Solver):
+    def __init__(
+        self,
+        map_obj,
+        heuristic_fn,
+        weight: float = 1.0,
+        max_expansions: int = 2_000_000,
+        macro: bool = False,
+        stats: SolverStats | None = None
+    ):
+        super().__init__(map_obj, heuristic_fn, stats)
+        self._solver = AStar(self.map, self.heuristic, weight=weight, macro=macro,
+                             stats=self.stats)
+        self._solver.max_expansions = max_expansions
+
+    def solve(self):
+        return self._solver.solve()
+
+    def metrics(self) -> dict:
+        return {**super().metrics(), "generated": self._solver.generated}
+
+
+class IDAStarSolver(Solver):
+    def __init__(
+        self,
+        map_obj,
+        heuristic_fn,
+        max_expansions: int = 2_000_000,
+        macro: bool = False,
+        stats: SolverStats | None = None
+    ):
+        super().__init__(map_obj, heuristic_fn, stats)
+        self._solver = IDAStar(self.map, self.heuristic, macro=macro, stats=self.stats)
+        self._solver.max_expansions = max_expansions
+
+    def use_successor_cache(self, cache: SuccessorCache | None):
+        super().use_successor_cache(cache)
+        self._solver.succ_cache = cache
+
+    def solve(self):
+        return self._solver.solve()
+
+    def metrics(self) -> dict:
+        return {**super().metrics(), "iterations": self._solver.iterations}
+
+
+class BidirectionalSolver(Solver):
+    """
+    Cautare bidirectionala pe mutari de cutii; euristica nu e folosita (BFS pe straturi),
+    deadlock-urile se elimina cu tabela de patrate moarte a nivelului.
+    """
+
+    def __init__(
+        self,
+        map_obj,
+        heuristic_fn,
+        max_expansions: int = 2_000_000,
+        stats: SolverStats | None = None
+    ):
+        super().__init__(map_obj, heuristic_fn, stats)
+        self._solver = BidirectionalSearch(self.map, stats=self.stats)
+        self._solver.max_expansions = max_expansions
+
+    def solve(self):
+        return self._solver.solve()
+
+    def metrics(self) -> dict:
+        forward, backward = self._solver.tree_sizes
+        return {**super().metrics(), "forward": forward, "backward": backward}
+
+
+class GreedySolver(Solver):
+    """
+    Implicit hill climbing: mereu spre succesorul cu h minim, fara memorie.
+    Cu best_first=True ruleaza GBFS (heap + multimea starilor vazute, cu revenire la alte ramuri);
+    cu weight, prioritatea devine g + w·h (weighted A*). max_steps = pasi, respectiv expandari.
+    """
+
+    def __init__(
+        self,
+        map_obj,
+        heuristic_fn,
+        stats: SolverStats | None = None,
+        max_steps: int | None = None,
+        best_first: bool = False,
+        weight: float | None = None,
+        macro: bool = False
+    ):
+        super().__init__(map_obj, heuristic_fn, stats)
+        self.max_steps = max_steps
+        self.best_first = best_first
+        self.weight = weight
+        self.macro = macro
+        self.last_steps = 0
+
+    def solve(self, max_steps: int | None = None):
+        max_steps = max_steps or self.max_steps
+        if self.best_first:
+            search = GreedyBestFirst(self.map, self.heuristic, weight=self.weight, macro=self.macro,
+                                     stats=self.stats, batch_fn=self.heuristic_batch)
+            try:
+                return search.solve(max_steps)
+            finally:
+                self.last_steps = search.expanded
+
+        cur = self.map.to_state()
+        trace = Trace(cur)
+        for step in itertools.count(1):
+            if max_steps and step > max_steps:
+                raise TimeoutError("GreedySolver: buget epuizat")
+            if cur.is_solved():
+                self.last_steps = step - 1
+                return trace
+            all_succs = self._expand(cur)
+            succs = [succ for succ in all_succs if succ[2] < float('inf')]
+            self.stats.deadlock_prunes += len(all_succs) - len(succs)
+            if not succs:
+                raise RuntimeError("GreedySolver: dead-end")
+            move, cur, _ = min(succs, key=lambda msh: msh[2])
+            trace.append(move)
+
+    def metrics(self) -> dict:
+        return {**super().metrics(), "Greedy_iters": self.last_steps}
+
+
+class _SAChain:
+    """Un lant SA: RNG propriu, pozitia curenta (compacta), mutarile facute si temperatura."""
+
+    __slots__ = ('index', 'rng', 'player_cell', 'box_cells', 'moves', 'h', 'T', 'steps', 'solved', 'done')
+
+    def __init__(self, index, seed, start, T0):
+        self.index = index
+        self.rng = random.Random(seed)
+        self.player_cell = start.player_cell
+        self.box_cells = start.box_cells
+        self.moves = array('B')
+        self.h = None
+        self.T = T0
+        self.steps = 0
+        self.solved = False
+        self.done = False
+
+
+def _anneal(chain, level, heuristic, heuristic_batch, stats, alpha, min_T, max_steps, until,
+            succ_cache=None):
+    """
+    Avanseaza lantul pana la pasul until (sau pana se rezolva / se raceste / se termina bugetul).
+    Foloseste doar chain.rng, deci rezultatul nu depinde de procesul in care ruleaza.
+    Cu succ_cache, o stare revizitata isi ia succesorii si h-urile din cache.
+    """
+    cur = State(level, chain.player_cell, chain.box_cells)
+    h_cur = heuristic(cur) if chain.h is None else chain.h
+    rng, moves = chain.rng, chain.moves
+    T, steps = chain.T, chain.steps
+    limit = min(max_steps, until)
+    expanded = None
+
+    while T > min_T and steps < limit:
+        if cur.is_solved():
+            chain.solved = True
+            break
+        # Vecinii si h-urile lor se calculeaza o data per stare; mutarile respinse
+        # aleg din nou din acelasi set fara alte apeluri ale euristicii
+        if expanded is not cur:
+            succs = succ_cache.get(cur) if succ_cache is not None else None
+            if succs is None:
+                t0 = time.perf_counter()
+                succs = cur.successors()
+                stats.expanded(succs, time.perf_counter() - t0)
+                h_vals = heuristic_batch([s for _, s in succs])
+                succs = [(m, s, h) for (m, s), h in zip(succs, h_vals)]
+                if succ_cache is not None:
+                    succ_cache.put(cur, succs)
+            expanded = cur
+        move, neigh, h_neigh = succs[rng.randrange(len(succs))]
+        if h_neigh == float('inf'):
+            stats.deadlock_prunes += 1
+            steps += 1
+            T *= alpha
+            continue
+        delta = h_neigh - h_cur
+        if delta < 0 or math.exp(-delta / T) > rng.random():
+            cur, h_cur = neigh, h_neigh
+            moves.append(move)
+        T *= alpha
+        steps += 1
+
+    chain.player_cell, chain.box_cells, chain.h = cur.player_cell, cur.box_cells, h_cur
+    chain.T, chain.steps = T, steps
+    chain.done = chain.solved or T <= min_T or steps >= max_steps
+    return chain
+
+
+# Contextul fiecarui proces din pool-ul SA, primit o singura data la pornire
+_SA_WORKER = {}
+
+
+def _init_sa_worker(map_obj, heuristic_type, alpha, min_T, max_steps):
+    heuristic = HEURISTICS[heuristic_type]
+    _SA_WORKER.update(level=map_obj.level, heuristic=heuristic,
+                      heuristic_batch=batch_heuristic(heuristic),
+                      alpha=alpha, min_T=min_T, max_steps=max_steps)
+
+
+def _sa_epoch_job(job):
+    chain, until = job
+    ctx = _SA_WORKER
+    stats = SolverStats()
+    _anneal(chain, ctx['level'], ctx['heuristic'], ctx['heuristic_batch'], stats,
+            ctx['alpha'], ctx['min_T'], ctx['max_steps'], until)
+    return chain, stats
+
+
+class SimulatedAnnealingSolver(Solver):
+    """
+    restarts lanturi SA, fiecare cu random.Random(seed + r).
+    Implicit ruleaza pe rand, ca inainte. Cu workers > 1 sau exchange_every, lanturile avanseaza
+    in paralel in epoci de exchange_every pasi (implicit epoch_steps); dupa fiecare epoca se opreste
+    la primul lant rezolvat (cel mai mic index). Cu exchange_every, lanturile au temperaturi
+    T0 · ladder^r si, intre epoci, lanturile vecine isi schimba starile (replica exchange / parallel
+    tempering) cu criteriul Metropolis. Rezultatul depinde doar de seed-uri, nu si de numarul de procese.
+    Cu incremental=True lanturile folosesc motorul din simulated_annealing: o mutare aleatoare aplicata
+    pe loc (cu undo), energia = suma distantelor cutiilor pana la cea mai apropiata tinta.
+    """
+
+    def __init__(
+        self,
+        map_obj,
+        heuristic_fn,
+        T0: float = 2000.0,
+        alpha: float = 0.999,
+        min_T: float = 1e-4,
+        max_steps: int = 500_000,
+        restarts: int = 5,
+        seed: int = 0,
+        stats: SolverStats | None = None,
+        workers: int = 1,
+        exchange_every: int | None = None,
+        ladder: float = 0.5,
+        epoch_steps: int = 2000,
+        incremental: bool = False
+    ):
+        super().__init__(map_obj, heuristic_fn, stats)
+        if incremental and (workers > 1 or exchange_every):
+            raise ValueError("SA incremental ruleaza doar secvential (fara workers / exchange)")
+        self.T0 = T0
+        self.alpha = alpha
+        self.min_T = min_T
+        self.max_steps = max_steps
+        self.restarts = restarts
+        self.seed = seed
+        self.workers = workers
+        self.exchange_every = exchange_every
+        self.ladder = ladder
+        self.epoch_steps = epoch_steps
+        self.incremental = incremental
+        self.last_steps = 0
+        self.exchanges = 0
+
+    def _anneal(self, chain, until):
+        return _anneal(chain, self.map.level, self.heuristic, self.heuristic_batch, self.stats,
+                       self.alpha, self.min_T, self.max_steps, until, self.succ_cache)
+
+    def solve(self):
+        start = self.map.to_state()
+        if self.incremental:
+            return self._solve_incremental(start)
+        if self.workers > 1 or self.exchange_every:
+            chain = self._solve_parallel(start)
+        else:
+            chain = self._solve_sequential(start)
+        self.last_steps = chain.steps
+        return Trace(start, chain.moves)
+
+    def _solve_sequential(self, start):
+        best = None
+        for r in range(self.restarts):
+            chain = self._anneal(_SAChain(r, self.seed + r, start, self.T0), self.max_steps)
+            if chain.solved:
+                return chain
+            if best is None or len(chain.moves) > len(best.moves):
+                best = chain
+        return best
+
+    def _solve_incremental(self, start):
+        push = getattr(self.heuristic, '__wrapped__', None) is min_matching_push_distance
+        box_cost = nearest_target_costs(start.level, push=push)
+        best, best_steps = None, 0
+
+        for r in range(self.restarts):
+            engine = SimulatedAnnealing(start, box_cost, T0=self.T0, alpha=self.alpha, min_T=self.min_T,
+                                        max_steps=self.max_steps, rng=random.Random(self.seed + r))
+            trace = engine.solve()
+            # Fara copii de stari: o iteratie = o singura lista de mutari legale
+            self.stats.expansions += engine.steps
+            self.stats.deadlock_prunes += engine.deadlock_prunes
+            if engine.is_solved():
+                self.last_steps = engine.steps
+                return trace
+            if best is None or len(trace) > len(best):
+                best, best_steps = trace, engine.steps
+
+        self.last_steps = best_steps
+        return best
+
+    def _solve_parallel(self, start):
+        exchange = bool(self.exchange_every)
+        epoch = self.exchange_every or self.epoch_steps
+        chains = [_SAChain(r, self.seed + r, start,
+                           self.T0 * (self.ladder ** r if exchange else 1.0))
+                  for r in range(self.restarts)]
+        exchange_rng = random.Random(self.seed)
+        self.exchanges = 0
+
+        pool = None
+        if self.workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            # NumPy si tabelele nivelului se incarca inainte de fork
+            self.heuristic_batch([start])
+            names = {fn: name for name, fn in HEURISTICS.items()}
+            heuristic_type = names[self.heuristic.__wrapped__]
+            pool = ProcessPoolExecutor(
+                max_workers=min(self.workers, len(chains)),
+                initializer=_init_sa_worker,
+                initargs=(self.map, heuristic_type, self.alpha, self.min_T, self.max_steps))
+
+        try:
+            for round_number in itertools.count():
+                active = [chain for chain in chains if not chain.done]
+                if not active:
+                    break
+                jobs = [(chain, chain.steps + epoch) for chain in active]
+                if pool is None:
+                    advanced = [self._anneal(chain, until) for chain, until in jobs]
+                else:
+                    advanced = []
+                    for chain, stats in pool.map(_sa_epoch_job, jobs):
+                        self.stats.merge(stats)
+                        advanced.append(chain)
+                for chain in advanced:
+                    chains[chain.index] = chain
+
+                solved = [chain for chain in chains if chain.solved]
+                if solved:
+                    return solved[0]
+                if exchange:
+                    self._exchange(chains, exchange_rng, round_number % 2)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        return max(chains, key=lambda chain: len(chain.moves))
+
+    def _exchange(self, chains, rng, offset):
+        """Lanturile vecine (r, r+1) isi schimba starile cu prob. min(1, exp((h_r - h_r+1)(1/T_r - 1/T_r+1)))."""
+        for r in range(offset, len(chains) - 1, 2):
+            a, b = chains[r], chains[r + 1]
+            if a.done or b.done:
+                continue
+            log_p = (a.h - b.h) * (1 / a.T - 1 / b.T)
+            if log_p >= 0 or rng.random() < math.exp(log_p):
+                a.player_cell, b.player_cell = b.player_cell, a.player_cell
+                a.box_cells, b.box_cells = b.box_cells, a.box_cells
+                a.moves, b.moves = b.moves, a.moves
+                a.h, b.h = b.h, a.h
+                self.exchanges += 1
+
+    def metrics(self) -> dict:
+        metrics = {**super().metrics(), "SA_iters": self.last_steps}
+        if self.exchange_every:
+            metrics["exchanges"] = self.exchanges
+        return metrics
+
+
+class AdaptiveSolver(Solver):
+    def __init__(
+        self,
+        map_obj,
+        heuristic_fn,
+        greedy_budget: int = 4000,
+        lrta_budget: int = 300_000,
+        macro: bool = False,
+        stats: SolverStats | None = None,
+        store_dir: str | None = None,
+        store_size: int = 1_000_000,
+        trials: int = 1,
+        time_budget: float | None = None
+    ):
+        super().__init__(map_obj, heuristic_fn, stats)
+        self.greedy_budget = greedy_budget
+        self.lrta_budget = lrta_budget
+        self.macro = macro
+        self.store_dir = store_dir
+        self.store_size = store_size
+        self.trials = trials
+        self.time_budget = time_budget
+        # Etapa care a rezolvat harta (sau ultima incercata): gbfs, lrta* sau sa
+        self.stage = None
+
+    def solve(self):
+        try:
+            self.stage = 'gbfs'
+            # GBFS nu revine in stari deja vazute, deci bugetul nu se pierde pe cicluri
+            gs = GreedySolver(self.map, self.heuristic, stats=self.stats, best_first=True, macro=self.macro)
+            trace = gs.solve(max_steps=self.greedy_budget)
+            print(f"  AdaptiveSolver: solved GBFS in {gs.last_steps} expandari ({len(trace)} pasi)")
+            return trace
+        except TimeoutError:
+            print("  AdaptiveSolver: buget GBFS epuizat, trec la LRTA*")
+        except Exception:
+            print("  AdaptiveSolver: GBFS a esuat, trec la LRTA*")
+
+        try:
+            self.stage = 'lrta*'
+            lrta = LrtaStarSolver(self.map, self.heuristic, max_steps=self.lrta_budget,
+                                  macro=self.macro, stats=self.stats,
+                                  store_dir=self.store_dir, store_size=self.store_size,
+                                  trials=self.trials, time_budget=self.time_budget)
+            lrta.use_successor_cache(self.succ_cache)
+            trace = lrta.solve()
+            print(f"  AdaptiveSolver: solved LRTA* în {len(trace)} pasi")
+            return trace
+        except TimeoutError:
+            print("  AdaptiveSolver: LRTA* timeout, trec la SA")
+
+        self.stage = 'sa'
+
+        sa = SimulatedAnnealingSolver(
+            self.map,
+            self.heuristic,
+            T0=2000.0,
+            alpha=0.999,
+            min_T=1e-4,
+            max_steps=500_000,
+            restarts=5,
+            seed=0,
+            stats=self.stats
+        )
+        sa.use_successor_cache(self.succ_cache)
+        trace = sa.solve()
+        print(f"  AdaptiveSolver: fallback SA dupa {sa.last_steps} iteratii")
+        return trace
+
+    def metrics(self) -> dict:
+        return {**super().metrics(), "stage": self.stage}
+
+# (eticheta, algoritm, campuri SolverOptions peste optiunile portofoliului)
+DEFAULT_PORTFOLIO = (
+    ('gbfs', 'gbfs', {'max_steps': 4000}),
+    ('lrta*', 'lrta*', {}),
+    ('sa-0', 'sa', {'seed': 0}),
+    ('sa-1', 'sa', {'seed': 1}),
+)
+
+
+def _portfolio_worker(label, algorithm, options, map_obj, results):
+    """Ruleaza o strategie intr-un proces separat si trimite (eticheta, mutari, metrici, eroare)."""
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            # Fara AdaptiveSolver: etapa lui GBFS e deja o strategie separata a portofoliului
+            solver = get_solver(algorithm, map_obj, options, adaptive=False)
+            trace = solver.run()
+            results.put((label, bytes(trace.moves), solver.metrics(), None,
+                         time.perf_counter() - t0))
+        except Exception as e:
+            results.put((label, None, None, str(e), time.perf_counter() - t0))
+
+
+class PortfolioSolver(Solver):
+    """
+    Porneste toate strategiile deodata, fiecare in procesul ei, pe aceeasi harta.
+    Prima solutie verificata castiga, celelalte procese sunt oprite; self.winner retine strategia.
+    Strategiile pornesc de la options (generator de mutari, macro, cache de succesori...).
+    """
+
+    # Cat asteapta bucla dupa un rezultat inainte sa verifice daca vreun proces a murit
+    POLL_INTERVAL = 0.2
+
+    def __init__(
+        self,
+        map_obj,
+        heuristic_fn,
+        strategies=DEFAULT_PORTFOLIO,
+        max_steps: int | None = None,
+        timeout: float | None = None,
+        options: SolverOptions | None = None
+    ):
+        super().__init__(map_obj, heuristic_fn)
+        names = {fn: name for name, fn in HEURISTICS.items()}
+        self.heuristic_type = names[getattr(self.heuristic, '__wrapped__', heuristic_fn)]
+        self.options = replace(options or SolverOptions(), heuristic=self.heuristic_type)
+        self.strategies = strategies
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.winner = None
+        self.winner_metrics = None
+        self.outcomes = {}
+
+    def solve(self):
+        import multiprocessing
+        import queue
+
+        # Importa NumPy si tabelele nivelului o data, inainte de fork, nu in fiecare proces
+        self.heuristic_batch([self.map.to_state()])
+
+        ctx = multiprocessing.get_context()
+        results = ctx.Queue()
+        processes = {}
+        for label, algorithm, options in self.strategies:
+            options = replace(self.options, **{'max_steps': self.max_steps, **options})
+            proc = ctx.Process(target=_portfolio_worker,
+                               args=(label, algorithm, options, self.map, results),
+                               daemon=True)
+            proc.start()
+            processes[label] = proc
+
+        t0 = time.perf_counter()
+        deadline = t0 + self.timeout if self.timeout else None
+        self.winner = self.winner_metrics = None
+        self.outcomes = {}
+        try:
+            while len(self.outcomes) < len(processes):
+                wait = self.POLL_INTERVAL
+                if deadline is not None:
+                    wait = min(wait, deadline - time.perf_counter())
+                    if wait <= 0:
+                        raise TimeoutError(f"PortfolioSolver: nicio solutie in {self.timeout}s")
+                try:
+                    label, moves, metrics, error, elapsed = results.get(timeout=wait)
+                except queue.Empty:
+                    # Un proces omorat (OOM, semnal) nu mai trimite nimic: altfel bucla ar astepta la nesfarsit
+                    dead = [label for label, proc in processes.items()
+                            if label not in self.outcomes and not proc.is_alive()]
+                    if dead and results.empty():
+                        for label in dead:
+                            error = f"procesul s-a oprit, exitcode {processes[label].exitcode}"
+                            self.outcomes[label] = {"status": "failed", "time_s": time.perf_counter() - t0,
+                                                    "error": error}
+                            print(f"  PortfolioSolver: {label} a esuat ({error})")
+                    continue
+
+                if error is None:
+                    trace = Trace(self.map, moves)
+                    if trace.is_solved():
+                        self.outcomes[label] = {"status": "won", "time_s": elapsed}
+                        self.winner, self.winner_metrics = label, metrics
+                        print(f"  PortfolioSolver: castiga {label} in {elapsed:.2f}s")
+                        return trace
+                    error = "solutie invalida"
+                self.outcomes[label] = {"status": "failed", "time_s": elapsed, "error": error}
+                print(f"  PortfolioSolver: {label} a esuat ({error})")
+        finally:
+            # Restul strategiilor nu mai conteaza: procesele se opresc imediat
+            for proc in processes.values():
+                if proc.is_alive():
+                    proc.terminate()
+            for proc in processes.values():
+                proc.join()
+            for label, _, _ in self.strategies:
+                self.outcomes.setdefault(label, {"status": "cancelled"})
+
+        raise RuntimeError("PortfolioSolver: toate strategiile au esuat")
+
+    def metrics(self) -> dict:
+        # Procesul parinte doar asteapta: contoarele raportate sunt ale strategiei castigatoare
+        metrics = super().metrics()
+        if self.winner_metrics:
+            metrics.update({key: value for key, value in self.winner_metrics.items()
+                            if key in metrics and key != "time_s"})
+        return {**metrics, "winner": self.winner,
+                "strategies": self.outcomes, "winner_metrics": self.winner_metrics}
+
+
+def get_solver(algorithm: str, map_obj, options: SolverOptions | None = None, adaptive: bool = True):
+    """
+    Construieste solverul cerut cu optiunile date. Cu options.succ_cache_size, LRTA*, SA si IDA*
+    isi iau succesorii starilor revizitate dintr-un SuccessorCache (LRU) de cel mult atatea stari.
+    Cu adaptive=False, lrta* e mereu LRTA* simplu, si pe bugetele mari (unde altfel e AdaptiveSolver).
+    """
+    options = options or SolverOptions()
+    solver = _build_solver(algorithm, map_obj, options, adaptive)
+    # A*, GBFS si bidir au deja multimea starilor vazute, iar portofoliul ruleaza in alte procese
+    if options.succ_cache_size and algorithm not in ('astar', 'gbfs', 'bidir', 'portfolio'):
+        solver.use_successor_cache(SuccessorCache(options.succ_cache_size))
+    return solver
+
+
+def _build_solver(algorithm, map_obj, options, adaptive):
+    if options.heuristic is None:
+        options = replace(options, heuristic=default_heuristic(algorithm))
+    if options.heuristic not in HEURISTICS:
+        raise ValueError(f"Unknown heuristic: {options.heuristic}")
+    if options.movegen not in MOVE_GENERATORS:
+        raise ValueError(f"Unknown move generator: {options.movegen}")
+    heur_fn = HEURISTICS[options.heuristic]
+    # Generatorul de mutari tine de nivel, toate starile hartii il folosesc
+    map_obj.level.use_bitboards(options.movegen == 'bitboard')
+    # Bazele de tipare (euristicile pdb / pdb-max) se construiesc la primul apel si se refolosesc din pdb_dir
+    configure_pattern_databases(options.pdb_dir, options.pdb_size)
+    max_steps, macro, weight = options.max_steps, options.macro, options.weight
+
+    if algorithm == 'lrta*':
+        # Trial-urile repetate si H-ul de pe disc sunt ale LRTA*: Adaptive le-ar sari
+        # daca GBFS rezolva harta primul
+        lrta_only = options.trials > 1 or options.time_budget or options.h_store
+        if adaptive and max_steps and max_steps > 200_000 and not lrta_only:
+            return AdaptiveSolver(map_obj, heur_fn,
+                                  greedy_budget=4000,
+                                  lrta_budget=max_steps,
+                                  macro=macro,
+                                  store_dir=options.h_store,
+                                  store_size=options.h_store_size,
+                                  trials=options.trials,
+                                  time_budget=options.time_budget)
+        return LrtaStarSolver(map_obj, heur_fn, max_steps or 500_000, macro=macro,
+                              store_dir=options.h_store, store_size=options.h_store_size,
+                              trials=options.trials, time_budget=options.time_budget)
+
+    if algorithm == 'astar':
+        return AStarSolver(map_obj, heur_fn, weight=weight or 1.0,
+                           max_expansions=max_steps or 2_000_000, macro=macro)
+
+    if algorithm == 'gbfs':
+        return GreedySolver(map_obj, heur_fn, max_steps=max_steps or 2_000_000,
+                            best_first=True, weight=weight, macro=macro)
+
+    if algorithm == 'bidir':
+        return BidirectionalSolver(map_obj, heur_fn, max_expansions=max_steps or 2_000_000)
+
+    if algorithm == 'idastar':
+        return IDAStarSolver(map_obj, heur_fn,
+                             max_expansions=max_steps or 2_000_000, macro=macro)
+
+    if algorithm == 'sa':
+        ms = max_steps or 500_000
+        return SimulatedAnnealingSolver(
+            map_obj,
+            heur_fn,
+            T0=2000.0,
+            alpha=0.999,
+            min_T=1e-4,
+            max_steps=ms,
+            restarts=5,
+            seed=options.seed,
+            workers=options.sa_workers,
+            exchange_every=options.sa_exchange,
+            incremental=options.sa_incremental
+        )
+
+    if algorithm == 'portfolio':
+        return PortfolioSolver(map_obj, heur_fn, max_steps=max_steps, options=options)
+
+    raise ValueError(f"Unknown algorithm: {algorithm}")
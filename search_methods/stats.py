@@ -0,0 +1,113 @@
+"""
+Instrumentation shared by all solvers: counters, time per phase and an optional cProfile hook.
+"""
+
+import time
+
+
+class SolverStats:
+    """
+    Counters filled in by the solvers while they search.
+
+    expansions        – states whose successors were generated
+    states_allocated  – successor states created
+    heuristic_calls   – calls to the heuristic function (counted by the wrapper from counting())
+    deadlock_prunes   – successors dropped because h = inf
+    cache_hits/misses – heuristic cache lookups made during solve()
+    time_s            – seconds per phase: expand, heuristic, select (the rest of the loop) and total
+    """
+
+    def __init__(self):
+        self.expansions = 0
+        self.states_allocated = 0
+        self.heuristic_calls = 0
+        self.deadlock_prunes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.expand_time = 0.0
+        self.heuristic_time = 0.0
+        self.total_time = 0.0
+
+    def counting(self, heuristic_fn):
+        """Wraps a heuristic so every call is counted and timed; wrapping twice is a no-op."""
+        if getattr(heuristic_fn, "__stats__", None) is self:
+            return heuristic_fn
+
+        clock = time.perf_counter
+
+        def counted(state):
+            t0 = clock()
+            value = heuristic_fn(state)
+            self.heuristic_time += clock() - t0
+            self.heuristic_calls += 1
+            return value
+
+        counted.__stats__ = self
+        counted.__wrapped__ = heuristic_fn
+        counted.__name__ = getattr(heuristic_fn, "__name__", "heuristic")
+        return counted
+
+    def counting_batch(self, batch_fn):
+        """Same as counting() for a batch heuristic: one call per evaluated state."""
+        if getattr(batch_fn, "__stats__", None) is self:
+            return batch_fn
+
+        clock = time.perf_counter
+
+        def counted(states):
+            t0 = clock()
+            values = batch_fn(states)
+            self.heuristic_time += clock() - t0
+            self.heuristic_calls += len(states)
+            return values
+
+        counted.__stats__ = self
+        return counted
+
+    def expanded(self, successors, seconds):
+        self.expansions += 1
+        self.states_allocated += len(successors)
+        self.expand_time += seconds
+
+    def merge(self, other):
+        """Adds the counters of another SolverStats (e.g. filled in by a worker process)."""
+        for name in ("expansions", "states_allocated", "heuristic_calls", "deadlock_prunes",
+                     "cache_hits", "cache_misses", "expand_time", "heuristic_time"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def to_dict(self) -> dict:
+        select = max(0.0, self.total_time - self.expand_time - self.heuristic_time)
+        return {
+            "expansions": self.expansions,
+            "states_allocated": self.states_allocated,
+            "heuristic_calls": self.heuristic_calls,
+            "deadlock_prunes": self.deadlock_prunes,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "time_s": {
+                "expand": round(self.expand_time, 6),
+                "heuristic": round(self.heuristic_time, 6),
+                "select": round(select, 6),
+                "total": round(self.total_time, 6),
+            },
+        }
+
+
+def profile_call(fn, out_path=None, top=20):
+    """
+    Runs fn() under cProfile. Dumps the raw profile to out_path (readable with pstats / snakeviz)
+    and returns (result, text with the top functions by cumulative time).
+    """
+    import cProfile
+    import io
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        result = profiler.runcall(fn)
+    finally:
+        if out_path:
+            profiler.dump_stats(out_path)
+    buf = io.StringIO()
+    pstats.Stats(profiler, stream=buf).sort_stats("cumulative").print_stats(top)
+    return result, buf.getvalue()
@@ -1,17 +1,26 @@
-from .dummy import Dummy
-from .box import Box
-from .player import Player
-from .map import Map
-from .moves import (
-    LEFT, 
-    RIGHT, 
-    UP, 
-    DOWN, 
-    BOX_LEFT, 
-    BOX_RIGHT, 
-    BOX_UP, 
-    BOX_DOWN, 
-    moves_meaning
-)
-
-from .gif import save_images, create_gif
\ No newline at end of file
+from .dummy import Dummy
+from .box import Box
+from .player import Player
+from .map import Map
+from .level import Level
+from .state import State
+from .trace import Trace
+from .moves import (
+    LEFT, 
+    RIGHT, 
+    UP, 
+    DOWN, 
+    BOX_LEFT, 
+    BOX_RIGHT, 
+    BOX_UP, 
+    BOX_DOWN, 
+    moves_meaning
+)
+
+
+def __getattr__(name):
+    # The GIF helpers pull in imageio, so they are only imported when first used
+    if name in ('save_images', 'create_gif', 'render_gif'):
+        from . import gif
+        return getattr(gif, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
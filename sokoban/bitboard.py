@@ -0,0 +1,123 @@
+from .moves import *
+from .state import State
+
+
+__all__ = ['Bitboards']
+
+
+class Bitboards:
+    '''
+    Bitboards Class generates the moves of a state with shifts and masks over Python ints
+
+    The grid is padded with a border of walls, so a shifted bit can never wrap
+    around a row or leave the map and no move needs a bounds check
+    Padded bit of cell (x, y): (x + 1) * (width + 2) + (y + 1)
+
+    Attributes:
+    level: static level the bitboards are built for
+    stride: width of the padded grid
+    bits: padded bit of every cell of the level
+    walls: bitboard of the walls and of the border
+    directions: (move, padded shift, cell index offset) of every simple move
+    '''
+    def __init__(self, level):
+        self.level = level
+        self.stride = level.width + 2
+
+        self.bits = [1 << self._padded(cell) for cell in range(level.size)]
+
+        floor = 0
+        for cell in level.floor_cells:
+            floor |= self.bits[cell]
+        self.walls = ((1 << (self.stride * (level.length + 2))) - 1) & ~floor
+
+        # (move, padded shift, cell index offset) of every simple move
+        self.directions = [(move, dx * self.stride + dy, dx * level.width + dy)
+                           for move, (dx, dy) in move_deltas.items()]
+
+    def _padded(self, cell):
+        x, y = self.level.coords(cell)
+        return (x + 1) * self.stride + y + 1
+
+    def box_bits(self, box_cells):
+        ''' Returns the bitboard of the boxes'''
+        bits = self.bits
+        board = 0
+        for cell in box_cells:
+            board |= bits[cell]
+        return board
+
+    def _moves(self, state):
+        '''
+        Returns (move, future, moved_from, moved_to) for every legal move, moves in increasing order
+        moved_from / moved_to are the cells of the box the move drags or pushes, None for a plain walk
+        '''
+        walls = self.walls
+        boxes = self.box_bits(state.box_cells)
+        occupied = walls | boxes
+        player = self.bits[state.player_cell]
+        player_cell = state.player_cell
+        pulls = self.level.allow_pulls
+        moves = []
+        box_moves = []
+
+        for move, shift, step in self.directions:
+            if shift > 0:
+                ahead = player << shift
+                if ahead & walls:
+                    continue
+                behind = player >> shift
+                beyond = ahead << shift
+            else:
+                ahead = player >> -shift
+                if ahead & walls:
+                    continue
+                behind = player << -shift
+                beyond = ahead >> -shift
+
+            future = player_cell + step
+            if ahead & boxes:
+                # Walking into a box pushes it, with or without the BOX_* code
+                if not beyond & occupied:
+                    push = (future, future, future + step)
+                    moves.append((move, *push))
+                    box_moves.append((move + 4, *push))
+            else:
+                moves.append((move, future, None, None))
+                if pulls and behind & boxes:
+                    # Player drags the box behind him // e.g. _ P B => P B _
+                    box_moves.append((move + 4, future, player_cell - step, player_cell))
+
+        moves.extend(box_moves)
+        return moves
+
+    def legal_moves(self, state):
+        ''' Returns the possible moves of a state, same as State.filter_possible_moves'''
+        return [move for move, _, _, _ in self._moves(state)]
+
+    def successors(self, state):
+        ''' Returns (move, state) pairs for every possible move, same as State.successors'''
+        level = self.level
+        zobrist_player = level.zobrist_player
+        zobrist_box = level.zobrist_box
+        box_cells = state.box_cells
+        base = state.zhash ^ zobrist_player[state.player_cell]
+        successors = []
+        pushes = {}
+
+        for move, future, moved_from, moved_to in self._moves(state):
+            if moved_from is None:
+                successors.append((move, State(level, future, box_cells, base ^ zobrist_player[future])))
+                continue
+
+            # A push is listed twice (walk code and BOX_* code), both lead to the same state
+            new_state = pushes.get(move - 4) if move > DOWN else None
+            if new_state is None:
+                zhash = base ^ zobrist_player[future] ^ zobrist_box[moved_from] ^ zobrist_box[moved_to]
+                boxes = [moved_to if cell == moved_from else cell for cell in box_cells]
+                new_state = State(level, future, boxes, zhash)
+                if moved_from == future:
+                    pushes[move] = new_state
+            successors.append((move, new_state))
+
+        return successors
@@ -19,42 +19,21 @@ class Dummy:
 
     def get_future_position(self, move):
         ''' Returns the future position of the object based on the move'''
-        if move == LEFT:
-            return (self.x, self.y - 1)
-        elif move == RIGHT:
-            return (self.x, self.y + 1)
-        elif move == DOWN:
-            return (self.x - 1, self.y)
-        elif move == UP:
-            return (self.x + 1, self.y)
-        else:
+        if move not in move_deltas:
             raise ValueError('Move doesn\'t exist')
+        dx, dy = move_deltas[move]
+        return (self.x + dx, self.y + dy)
 
     def get_opposite_position(self, move):
         ''' Returns the opposite position of the object based on the move'''
-        if move == LEFT:
-            return (self.x, self.y + 1)
-        elif move == RIGHT:
-            return (self.x, self.y - 1)
-        elif move == DOWN:
-            return (self.x + 1, self.y)
-        elif move == UP:
-            return (self.x - 1, self.y)
-        else:
+        if move not in move_deltas:
             raise ValueError('Move doesn\'t exist')
+        dx, dy = move_deltas[move]
+        return (self.x - dx, self.y - dy)
 
     def make_move(self, move):
         ''' Updates the position of the object based on the move'''
-        if move == LEFT:
-            self.y -= 1
-        elif move == RIGHT:
-            self.y += 1
-        elif move == DOWN:
-            self.x -= 1
-        elif move == UP:
-            self.x += 1
-        else:
-            raise ValueError('Move doesn\'t exist')
+        self.x, self.y = self.get_future_position(move)
 
     def __str__(self):
         ''' Overriding toString method for Dummy class'''
@@ -0,0 +1,212 @@
+from .moves import *
+
+from array import array
+import random
+
+
+__all__ = ['Level', 'UNREACHABLE']
+
+# Distance stored for a cell a box can't push/pull its way out of
+UNREACHABLE = 0xFFFF
+
+# Fixed seed, so Zobrist keys are identical between runs and processes
+ZOBRIST_SEED = 0x5EED
+
+
+class Level:
+    '''
+    Level Class records the static part of the board, shared by every state of the same map
+
+    Cells are numbered row by row: cell = x * width + y
+    The geometry is preprocessed once, so moving an object is a table lookup
+
+    With allow_pulls the player may also drag a box behind him (BOX_* moves),
+    otherwise only pushes are legal and many more squares become dead
+
+    Attributes:
+    length: length of the map
+    width: width of the map
+    obstacles: list of obstacles given as tuples for positions on the map
+    targets: list of target positions given as tuples
+    walls: set of cell indices holding an obstacle
+    target_cells: tuple of cell indices holding a target
+    target_set: set of cell indices holding a target
+    floor_cells: tuple with the cell indices that are not walls
+    floor_index: floor number of every cell, -1 for walls
+    neighbours: for every simple move, the cell reached from each cell, -1 for a wall or the edge
+    wall_mask: bitmask of the wall cells
+    target_mask: bitmask of the target cells
+    allow_pulls: whether the player may drag boxes
+    dead_squares: 1 for every cell from which a box can never reach a target, 0 otherwise
+    box_distances: flat array('H') with the box moves from every cell to every target, target-major
+    zobrist_player / zobrist_box: random 64-bit key of the player / a box on every cell
+    bitboards: Bitboards move generator used by the states, None for the neighbour tables
+    test_name: name of the map
+    '''
+    def __init__(self, length, width, obstacles, targets, test_name='test', allow_pulls=True):
+        self.length = length
+        self.width = width
+        self.allow_pulls = allow_pulls
+        self.obstacles = [tuple(obstacle) for obstacle in obstacles]
+        self.targets = [tuple(target) for target in targets]
+        self.test_name = test_name
+
+        self.walls = frozenset(self.cell(x, y) for x, y in self.obstacles)
+        self.target_cells = tuple(self.cell(x, y) for x, y in self.targets)
+        self.target_set = frozenset(self.target_cells)
+
+        self.wall_mask = 0
+        for cell in self.walls:
+            self.wall_mask |= 1 << cell
+
+        self.target_mask = 0
+        for cell in self.target_cells:
+            self.target_mask |= 1 << cell
+
+        self.floor_cells = tuple(cell for cell in range(self.size) if cell not in self.walls)
+        self.floor_index = [-1] * self.size
+        for number, cell in enumerate(self.floor_cells):
+            self.floor_index[cell] = number
+
+        self.neighbours = {move: self._build_neighbours(move) for move in move_deltas}
+        self.dead_squares = self._build_dead_squares()
+        self.box_distances = self._build_box_distances()
+
+        rng = random.Random(ZOBRIST_SEED)
+        self.zobrist_player = [rng.getrandbits(64) for _ in range(self.size)]
+        self.zobrist_box = [rng.getrandbits(64) for _ in range(self.size)]
+
+        self.bitboards = None
+
+    @property
+    def size(self):
+        ''' Returns the number of cells on the map'''
+        return self.length * self.width
+
+    def cell(self, x, y):
+        ''' Returns the index of the cell at (x, y)'''
+        return x * self.width + y
+
+    def coords(self, cell):
+        ''' Returns the (x, y) position of a cell index'''
+        return divmod(cell, self.width)
+
+    def _build_neighbours(self, move):
+        ''' Returns the cell reached from every cell with a simple move, -1 for a wall or the edge'''
+        dx, dy = move_deltas[move]
+        table = [-1] * self.size
+
+        for cell in self.floor_cells:
+            x, y = self.coords(cell)
+            x, y = x + dx, y + dy
+
+            if 0 <= x < self.length and 0 <= y < self.width:
+                future = self.cell(x, y)
+                if future not in self.walls:
+                    table[cell] = future
+
+        return table
+
+    def _box_distances_to(self, sources):
+        '''
+        BFS backwards from the source cells over box moves: distance of a lone box from every cell
+        A box reaches cell from the previous cell on the same line if the player can stand behind it
+        to push it, or (with pulls) one cell ahead of cell to drag it
+        '''
+        distances = array('H', [UNREACHABLE]) * self.size
+        queue = list(sources)
+        for cell in queue:
+            distances[cell] = 0
+
+        for cell in queue:
+            for move, table in self.neighbours.items():
+                back = self.neighbours[opposite_moves[move]]
+
+                # Box moved with move from previous into cell
+                previous = back[cell]
+                if previous == -1 or distances[previous] != UNREACHABLE:
+                    continue
+
+                pushable = back[previous] != -1
+                pullable = self.allow_pulls and table[cell] != -1
+
+                if pushable or pullable:
+                    distances[previous] = distances[cell] + 1
+                    queue.append(previous)
+
+        return distances
+
+    def _build_box_distances(self):
+        ''' Flat table: box_distances[target_index * size + cell] = box moves from cell to that target'''
+        table = array('H')
+        for target in self.target_cells:
+            table.extend(self._box_distances_to([target]))
+        return table
+
+    def _build_dead_squares(self):
+        ''' Marks the cells from which a lone box can't reach any target'''
+        to_any_target = self._box_distances_to(self.target_cells)
+
+        dead = bytearray(self.size)
+        for cell in self.floor_cells:
+            dead[cell] = 1 if to_any_target[cell] == UNREACHABLE else 0
+
+        return dead
+
+    def use_bitboards(self, enabled=True):
+        ''' Switches the states of this level between the bitboard and the table move generator'''
+        if not enabled:
+            self.bitboards = None
+        elif self.bitboards is None:
+            from .bitboard import Bitboards
+            self.bitboards = Bitboards(self)
+
+    def fingerprint(self):
+        ''' Returns a hex digest of the geometry and move model, equal for the same map in any process'''
+        import hashlib
+
+        description = (self.length, self.width, sorted(self.walls), sorted(self.target_cells),
+                       self.allow_pulls, ZOBRIST_SEED)
+        return hashlib.sha1(repr(description).encode()).hexdigest()[:16]
+
+    def zobrist(self, player_cell, box_cells):
+        ''' Returns the Zobrist hash of a player / boxes configuration'''
+        key = self.zobrist_player[player_cell]
+        for cell in box_cells:
+            key ^= self.zobrist_box[cell]
+        return key
+
+    def box_distance(self, cell, target_index):
+        ''' Returns the box moves needed from cell to a target, UNREACHABLE if it can't get there'''
+        return self.box_distances[target_index * self.size + cell]
+
+    def box_distance_row(self, cell):
+        ''' Returns the box moves needed from cell to every target'''
+        size = self.size
+        return [self.box_distances[t * size + cell] for t in range(len(self.target_cells))]
+
+    def is_dead_square(self, cell):
+        ''' Checks if a box placed on cell can never reach a target'''
+        return self.dead_squares[cell] == 1
+
+    def neighbour(self, cell, move):
+        ''' Returns the cell reached from cell with a simple move, -1 for a wall or the edge of the map'''
+        return self.neighbours[move][cell]
+
+    def in_bounds(self, x, y):
+        ''' Checks if (x, y) is inside the map'''
+        return 0 <= x < self.length and 0 <= y < self.width
+
+    def is_wall(self, x, y):
+        ''' Checks if (x, y) is an obstacle or outside the map'''
+        if not self.in_bounds(x, y):
+            return True
+        return (self.wall_mask >> self.cell(x, y)) & 1 == 1
+
+    def is_target(self, cell):
+        ''' Checks if a cell holds a target'''
+        return (self.target_mask >> cell) & 1 == 1
+
+    def __str__(self):
+        ''' Overriding toString method for Level class'''
+        return f'Level {self.test_name}: {self.length}x{self.width}, {len(self.target_cells)} targets'
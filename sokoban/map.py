@@ -1,8 +1,9 @@
 from .player import Player
 from .box import Box
+from .level import Level
+from .state import State
 from .moves import *
 
-from matplotlib import pyplot as plt
 from typing import Optional
 import yaml
 import os
@@ -26,16 +27,21 @@ class Map:
     obstacles: list of obstacles given as tuples for positions on the map
     targets: list of target objects, positioned on the map
     map: 2D matrix representing the map
+    level: static level (walls, targets, dimensions) shared by all the copies of the map
     explored_states: number of explored states
     undo_moves: number of undo moves made // e.g. _ P B => P B _
     '''
-    def __init__(self, length, width, player_x, player_y, boxes, targets, obstacles, test_name='test'):
+    def __init__(self, length, width, player_x, player_y, boxes, targets, obstacles, test_name='test', level=None):
         self.length = length
         self.width = width
         self.map = [[0 for _ in range(width)] for _ in range(length)]
         self.obstacles = obstacles
         self.test_name = test_name
 
+        if level is None:
+            level = Level(length, width, obstacles, targets, test_name)
+        self.level = level
+
         self.explored_states = 0
         self.undo_moves = 0
 
@@ -59,7 +65,8 @@ class Map:
         self.targets = []
         for target_x, target_y in targets:
             self.targets.append((target_x, target_y))
-            self.map[target_x][target_y] = TARGET_SYMBOL
+            if (target_x, target_y) not in self.positions_of_boxes:
+                self.map[target_x][target_y] = TARGET_SYMBOL
 
     @classmethod
     def from_str(cls, state_str):
@@ -92,10 +99,15 @@ class Map:
 
 
     @classmethod
-    def from_yaml(cls, path):
+    def from_yaml(cls, path, allow_pulls=True):
         with open(path, 'r') as file:
             data = yaml.load(file, Loader=yaml.FullLoader)
 
+        test_name = path.split('/')[-1].split('.')[0]
+
+        # Static geometry is preprocessed once and shared by every copy of the map
+        level = Level(data['height'], data['width'], data['walls'], data['targets'], test_name, allow_pulls)
+
         return cls(
             length=data['height'], 
             width=data['width'], 
@@ -104,64 +116,42 @@ class Map:
             boxes=data['boxes'], 
             targets=data['targets'], 
             obstacles=data['walls'], 
-            test_name=path.split('/')[-1].split('.')[0]
+            test_name=test_name,
+            level=level
         )
 
     def object_in_bounds_move(self, checking_object, move):
         ''' Checks if the object moves inside the map'''
-        if move == LEFT:
-            if checking_object.y == 0:
-                return False
-        elif move == RIGHT:
-            if checking_object.y == self.width - 1:
-                return False
-        elif move == DOWN:
-            if checking_object.x == 0:
-                return False
-        elif move == UP:
-            if checking_object.x == self.length - 1:
-                return False
-        else:
+        if move not in move_deltas:
             raise ValueError('object_in_bounds_move outside range error')
 
-        return True
+        x, y = checking_object.get_future_position(move)
+        return self.level.in_bounds(x, y)
 
-    def object_valid_move(self, checking_object, move):
-        ''' Checks if the object moves outside the map / hits an obstacle or a box'''
-
-        if not self.object_in_bounds_move(checking_object, move):
-            return False
-
-        future_position = checking_object.get_future_position(move)
+    def object_future_cell(self, checking_object, move):
+        ''' Returns the cell the object moves to, -1 if it hits an obstacle or falls off the map'''
+        if move not in move_deltas:
+            raise ValueError('object_future_cell outside range error')
 
-        if not future_position:
-            raise ValueError('object_valid_move future position doesn\'t exist')
+        return self.level.neighbours[move][self.level.cell(checking_object.x, checking_object.y)]
 
-        x, y = future_position
-
-        # Future position is outside the map
-        # if x < 0 or x >= self.length or y < 0 or y >= self.width:
-        #     return False
+    def object_valid_move(self, checking_object, move):
+        ''' Checks if the object moves outside the map / hits an obstacle or a box'''
+        future = self.object_future_cell(checking_object, move)
 
-        if self.map[x][y] == OBSTACLE_SYMBOL:
+        if future == -1:
             return False
 
-        if self.map[x][y] == BOX_SYMBOL:
-            return False
-
-        return True
+        return self.level.coords(future) not in self.positions_of_boxes
 
     def player_valid_move(self, move):
         ''' Checks if the player moves outside the map / hits an obstacle'''
+        future = self.object_future_cell(self.player, move)
 
-        if not self.object_in_bounds_move(self.player, move):
-            return False
-
-        future_position = self.player.get_future_position(move)
-
-        if self.map[future_position[0]][future_position[1]] == OBSTACLE_SYMBOL:
+        if future == -1:
             return False
 
+        future_position = self.level.coords(future)
         if future_position in self.positions_of_boxes:
             box = self.boxes[self.positions_of_boxes[future_position]]
             return self.object_valid_move(box, move)
@@ -184,25 +174,24 @@ class Map:
         # The real, implicit move is the move - 4
         implicit_move = move - 4
 
-        if self.player_valid_move(implicit_move):
-            # Player gets in the position of the box
-            future_position = self.player.get_future_position(implicit_move)
-
-            # Or player gets to an empty space and drags the box behind him
-            # Case in which the box is in the opposite position of the player for the move
+        if not self.player_valid_move(implicit_move):
+            return False
 
-            straight_move_flag = False
-            if self.map[future_position[0]][future_position[1]] == BOX_SYMBOL:
-                straight_move_flag = self.object_valid_move(self.boxes[self.positions_of_boxes[future_position]], implicit_move)
+        level = self.level
+        player_cell = level.cell(self.player.x, self.player.y)
 
-            opposite_position = self.player.get_opposite_position(implicit_move)
-            if 0 <= opposite_position[0] < self.length and 0 <= opposite_position[1] < self.width:
-                if self.map[opposite_position[0]][opposite_position[1]] == BOX_SYMBOL:
-                    straight_move_flag = (straight_move_flag or self.object_valid_move(self.boxes[self.positions_of_boxes[opposite_position]], implicit_move))
+        # Player gets in the position of the box, player_valid_move already checked the push
+        future = level.neighbours[implicit_move][player_cell]
+        if level.coords(future) in self.positions_of_boxes:
+            return True
 
-            return straight_move_flag
+        # Or player gets to an empty space and drags the box behind him,
+        # the box then moves into the cell the player leaves, which is always free
+        if not level.allow_pulls:
+            return False
 
-        return False
+        behind = level.neighbours[opposite_moves[implicit_move]][player_cell]
+        return behind != -1 and level.coords(behind) in self.positions_of_boxes
 
     def is_valid_move(self, move):
         ''' Checks if the move is valid'''
@@ -222,7 +211,7 @@ class Map:
         if move < BOX_LEFT:
             if self.player_valid_move(move):
                 future_position = self.player.get_future_position(move)
-                if self.map[future_position[0]][future_position[1]] == BOX_SYMBOL:
+                if future_position in self.positions_of_boxes:
                     box = self.boxes[self.positions_of_boxes[future_position]]
 
                     # Update the position of the box in the dictionary
@@ -293,13 +282,27 @@ class Map:
 
     def copy(self):
         ''' Returns a copy of the current state'''
-        new_map = Map(self.length, self.width, self.player.x, self.player.y, [(box.name, box.x, box.y) for box in self.boxes.values()], self.targets, self.obstacles)
+        new_map = Map(self.length, self.width, self.player.x, self.player.y, [(box.name, box.x, box.y) for box in self.boxes.values()], self.targets, self.obstacles, self.test_name, level=self.level)
         new_map.map = [row.copy() for row in self.map]
         new_map.positions_of_boxes = self.positions_of_boxes.copy()
         new_map.explored_states = self.explored_states
         new_map.undo_moves = self.undo_moves
         return new_map
 
+    @property
+    def player_cell(self):
+        ''' Returns the cell index of the player'''
+        return self.level.cell(self.player.x, self.player.y)
+
+    @property
+    def box_cells(self):
+        ''' Returns the sorted cell indices of the boxes'''
+        return tuple(sorted(self.level.cell(box.x, box.y) for box in self.boxes.values()))
+
+    def to_state(self):
+        ''' Returns the compact, immutable state of the map'''
+        return State.from_map(self)
+
     def get_neighbours(self):
         ''' Returns the neighbours of the current state'''
         neighbours = []
@@ -344,43 +347,10 @@ class Map:
         save_path: Optional[str] = None, 
         save_name: Optional[str] = None
     ) -> None:
-        fig, ax = plt.subplots()
-        ax.imshow(self.map, cmap='viridis')
-
-        marker_size = 10
-        ax.invert_yaxis()
-
-        width_labels = [x - 0.5 for x in range(self.width)]
-        length_labels = [y - 0.5 for y in range(self.length)]
-
-        ax.grid(True, which='major', color='black', linewidth=1.5)
-        ax.set_xticks(width_labels)
-        ax.set_yticks(length_labels)
-        ax.xaxis.set_ticks_position('none')
-        ax.yaxis.set_ticks_position('none')
-        ax.xaxis.set_ticklabels([])
-        ax.yaxis.set_ticklabels([])
-
-        ax.plot(self.player.y, self.player.x, 'ro', markersize=1.5 * marker_size)
-
-        for box in self.boxes.values():
-            ax.plot(box.y, box.x, 'bs', markersize=marker_size)
-
-        for target_x, target_y in self.targets:
-            ax.plot(target_y, target_x, 'gx', markersize=marker_size)
-
-        if save_path:
-            os.makedirs(save_path, exist_ok=True)
-            if save_name is None:
-                save_name = 'default.png'
-            if not save_name.endswith('.png'):
-                save_name += '.png'
-            fig.savefig(os.path.join(save_path, save_name))
-
-        if show:
-            plt.show()
+        # matplotlib is only loaded when a map is actually drawn
+        from .plot import create_figure
 
-        plt.close(fig)
+        create_figure(self, show=show, save_path=save_path, save_name=save_name)
 
     def plot_map(self, save_path: Optional[str] = None, save_name: Optional[str] = None):
         self._create_figure(show=True, save_path=save_path, save_name=save_name)
@@ -0,0 +1,143 @@
+from .level import Level
+
+import numpy as np
+import os
+
+
+__all__ = ['Renderer', 'write_gif']
+
+
+TILE_SIZE = 32
+
+FLOOR_COLOR = (236, 236, 236)
+GRID_COLOR = (40, 40, 40)
+WALL_COLOR = (68, 1, 84)
+TARGET_COLOR = (44, 160, 44)
+BOX_COLOR = (31, 119, 180)
+BOX_ON_TARGET_COLOR = (23, 190, 207)
+PLAYER_COLOR = (214, 39, 40)
+
+
+def _square(tile, color, margin):
+    ''' RGBA sprite with a filled square, transparent around it'''
+    sprite = np.zeros((tile, tile, 4), dtype=np.uint8)
+    sprite[margin:tile - margin, margin:tile - margin, :3] = color
+    sprite[margin:tile - margin, margin:tile - margin, 3] = 255
+    return sprite
+
+
+def _disc(tile, color, radius):
+    ''' RGBA sprite with a filled circle in the middle'''
+    sprite = np.zeros((tile, tile, 4), dtype=np.uint8)
+    centre = (tile - 1) / 2
+    ys, xs = np.ogrid[:tile, :tile]
+    mask = (xs - centre) ** 2 + (ys - centre) ** 2 <= radius ** 2
+    sprite[mask, :3] = color
+    sprite[mask, 3] = 255
+    return sprite
+
+
+def _cross(tile, color, margin, thickness):
+    ''' RGBA sprite with an X drawn between the margins'''
+    sprite = np.zeros((tile, tile, 4), dtype=np.uint8)
+    ys, xs = np.ogrid[:tile, :tile]
+    inside = (xs >= margin) & (xs < tile - margin) & (ys >= margin) & (ys < tile - margin)
+    mask = inside & ((np.abs(xs - ys) < thickness) | (np.abs(xs + ys - (tile - 1)) < thickness))
+    sprite[mask, :3] = color
+    sprite[mask, 3] = 255
+    return sprite
+
+
+def _paste(image, sprite, top, left):
+    ''' Alpha-blends an RGBA sprite (fully opaque or fully transparent pixels) onto an RGB image'''
+    tile = sprite.shape[0]
+    window = image[top:top + tile, left:left + tile]
+    mask = sprite[:, :, 3] > 0
+    window[mask] = sprite[mask, :3]
+
+
+class Renderer:
+    '''
+    Renderer Class draws states straight into NumPy frames, without matplotlib or temporary files
+
+    The static background (floor, walls, targets, grid) is drawn once per level,
+    every frame only copies it and pastes the precomputed box / player sprites
+    Row 0 of the map is drawn at the bottom, as in Map.plot_map
+
+    Attributes:
+    level: static level the states belong to
+    tile: size of a cell in pixels
+    background: RGB frame of the empty level
+    '''
+    def __init__(self, level: Level, tile: int = TILE_SIZE):
+        self.level = level
+        self.tile = tile
+
+        self.box_sprite = _square(tile, BOX_COLOR, tile // 6)
+        self.box_on_target_sprite = _square(tile, BOX_ON_TARGET_COLOR, tile // 6)
+        self.player_sprite = _disc(tile, PLAYER_COLOR, tile * 0.32)
+
+        self.background = self._draw_background()
+
+    def _origin(self, cell):
+        ''' Returns the (top, left) pixel of a cell'''
+        x, y = self.level.coords(cell)
+        return (self.level.length - 1 - x) * self.tile, y * self.tile
+
+    def _draw_background(self):
+        level, tile = self.level, self.tile
+        image = np.empty((level.length * tile, level.width * tile, 3), dtype=np.uint8)
+        image[:, :] = FLOOR_COLOR
+
+        for cell in level.walls:
+            top, left = self._origin(cell)
+            image[top:top + tile, left:left + tile] = WALL_COLOR
+
+        target_sprite = _cross(tile, TARGET_COLOR, tile // 5, max(1, tile // 12))
+        for cell in level.target_cells:
+            _paste(image, target_sprite, *self._origin(cell))
+
+        image[::tile, :] = GRID_COLOR
+        image[:, ::tile] = GRID_COLOR
+        image[-1, :] = GRID_COLOR
+        image[:, -1] = GRID_COLOR
+        return image
+
+    def frame(self, state):
+        ''' Returns the RGB frame (uint8 array) of a State or Map'''
+        state = state.to_state()
+        image = self.background.copy()
+
+        for cell in state.box_cells:
+            sprite = self.box_on_target_sprite if cell in self.level.target_set else self.box_sprite
+            _paste(image, sprite, *self._origin(cell))
+
+        _paste(image, self.player_sprite, *self._origin(state.player_cell))
+        return image
+
+    def frames(self, states):
+        ''' Lazily renders an iterable of states'''
+        for state in states:
+            yield self.frame(state)
+
+
+def write_gif(states, gif_path, fps=5, tile=TILE_SIZE):
+    ''' Streams the frames of the states into a GIF file, nothing else touches the disk'''
+    import imageio.v2 as imageio
+
+    states = iter(states)
+    first = next(states, None)
+    if first is None:
+        raise ValueError('write_gif: no states to render')
+
+    directory = os.path.dirname(str(gif_path))
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    renderer = Renderer(first.to_state().level, tile)
+    with imageio.get_writer(gif_path, mode='I', duration=1000 / fps, loop=0) as writer:
+        writer.append_data(renderer.frame(first))
+        for frame in renderer.frames(states):
+            writer.append_data(frame)
+
+    return gif_path
@@ -0,0 +1,305 @@
+from .moves import *
+
+
+__all__ = ['State']
+
+
+class State:
+    '''
+    State Class records the dynamic part of the board in a compact, immutable and hashable form
+    The walls, targets and dimensions live in the Level shared by all the states of a map
+
+    Attributes:
+    level: static level the state belongs to
+    player_cell: cell index of the player
+    box_cells: sorted tuple with the cell indices of the boxes
+    zhash: 64-bit Zobrist hash of the configuration, updated in O(1) by every move
+    '''
+    __slots__ = ('level', 'player_cell', 'box_cells', 'zhash')
+
+    def __init__(self, level, player_cell, box_cells, zhash=None):
+        self.level = level
+        self.player_cell = player_cell
+        self.box_cells = tuple(sorted(box_cells))
+        self.zhash = level.zobrist(player_cell, self.box_cells) if zhash is None else zhash
+
+    @classmethod
+    def from_map(cls, map_obj):
+        ''' Builds the compact state of a Map'''
+        level = map_obj.level
+        return cls(
+            level,
+            level.cell(map_obj.player.x, map_obj.player.y),
+            [level.cell(box.x, box.y) for box in map_obj.boxes.values()]
+        )
+
+    def to_state(self):
+        ''' States are immutable, so they are their own compact form'''
+        return self
+
+    def to_map(self):
+        ''' Rebuilds a full Map from the compact state'''
+        from .map import Map
+
+        level = self.level
+        player_x, player_y = level.coords(self.player_cell)
+        boxes = [(f'box{i + 1}', *level.coords(cell)) for i, cell in enumerate(self.box_cells)]
+
+        return Map(level.length, level.width, player_x, player_y, boxes,
+                   level.targets, level.obstacles, level.test_name, level=level)
+
+    def key(self):
+        ''' Returns the canonical (boxes, player) key of the state'''
+        return self.box_cells, self.player_cell
+
+    @property
+    def player(self):
+        ''' Returns the (x, y) position of the player'''
+        return self.level.coords(self.player_cell)
+
+    @property
+    def boxes(self):
+        ''' Returns the (x, y) positions of the boxes'''
+        coords = self.level.coords
+        return tuple(coords(cell) for cell in self.box_cells)
+
+    @property
+    def targets(self):
+        ''' Returns the (x, y) positions of the targets'''
+        return self.level.targets
+
+    def _walk_target(self, move):
+        '''
+        Returns (future, pushed) for a simple move, or None if the player can't move
+        future is the cell of the player after the move, pushed is True if a box is in front of him
+        '''
+        table = self.level.neighbours[move]
+        future = table[self.player_cell]
+
+        if future == -1:
+            return None
+
+        if future in self.box_cells:
+            beyond = table[future]
+            if beyond == -1 or beyond in self.box_cells:
+                return None
+            return future, True
+
+        return future, False
+
+    def is_valid_move(self, move):
+        ''' Checks if the move is valid, with the same rules as Map.is_valid_move'''
+        if move < BOX_LEFT:
+            return self._walk_target(move) is not None
+        elif move <= BOX_DOWN:
+            implicit_move = move - 4
+            walk = self._walk_target(implicit_move)
+            if walk is None:
+                return False
+            if walk[1]:
+                return True
+            if not self.level.allow_pulls:
+                return False
+
+            behind = self.level.neighbours[opposite_moves[implicit_move]][self.player_cell]
+            return behind != -1 and behind in self.box_cells
+        else:
+            raise ValueError('is_valid_move outside range error')
+
+    def _successor(self, move):
+        ''' Returns the state reached by applying the move, or None if the move is invalid'''
+        if move < BOX_LEFT:
+            implicit_move = move
+        elif move <= BOX_DOWN:
+            implicit_move = move - 4
+        else:
+            return None
+
+        walk = self._walk_target(implicit_move)
+        if walk is None:
+            return None
+
+        future, pushed = walk
+        if pushed:
+            # Player walks into the box and pushes it one cell further
+            moved_from = future
+            moved_to = self.level.neighbours[implicit_move][future]
+        elif move >= BOX_LEFT:
+            # Player drags the box behind him // e.g. _ P B => P B _
+            if not self.level.allow_pulls:
+                return None
+            moved_from = self.level.neighbours[opposite_moves[implicit_move]][self.player_cell]
+            if moved_from == -1 or moved_from not in self.box_cells:
+                return None
+            moved_to = self.player_cell
+        else:
+            zobrist_player = self.level.zobrist_player
+            zhash = self.zhash ^ zobrist_player[self.player_cell] ^ zobrist_player[future]
+            return State(self.level, future, self.box_cells, zhash)
+
+        zobrist_player = self.level.zobrist_player
+        zobrist_box = self.level.zobrist_box
+        zhash = (self.zhash
+                 ^ zobrist_player[self.player_cell] ^ zobrist_player[future]
+                 ^ zobrist_box[moved_from] ^ zobrist_box[moved_to])
+
+        boxes = [moved_to if cell == moved_from else cell for cell in self.box_cells]
+        return State(self.level, future, boxes, zhash)
+
+    def apply_move(self, move):
+        ''' Returns the state reached by applying the move'''
+        new_state = self._successor(move)
+        if new_state is None:
+            raise ValueError('Apply Error: Got to make an invalid move')
+        return new_state
+
+    def is_pull(self, move):
+        ''' Checks if a valid move drags a box instead of pushing it'''
+        if move < BOX_LEFT:
+            return False
+        return not self._walk_target(move - 4)[1]
+
+    def is_solved(self):
+        ''' Checks if all the boxes are on the targets'''
+        return self.level.target_set.issubset(self.box_cells)
+
+    def filter_possible_moves(self):
+        ''' Returns the possible moves the player can make'''
+        if self.level.bitboards is not None:
+            return self.level.bitboards.legal_moves(self)
+        return [move for move in range(LEFT, BOX_DOWN + 1) if self.is_valid_move(move)]
+
+    def successors(self):
+        ''' Returns (move, state) pairs for every possible move'''
+        if self.level.bitboards is not None:
+            return self.level.bitboards.successors(self)
+
+        successors = []
+        for move in range(LEFT, BOX_DOWN + 1):
+            new_state = self._successor(move)
+            if new_state is not None:
+                successors.append((move, new_state))
+        return successors
+
+    def get_neighbours(self):
+        ''' Returns the neighbours of the current state'''
+        return [state for _, state in self.successors()]
+
+    def reachable_cells(self):
+        ''' Returns the cells the player can walk to without moving any box'''
+        tables = tuple(self.level.neighbours.values())
+        # Walls (-1) and boxes start out as seen, so one lookup rejects all three
+        seen = {-1, self.player_cell, *self.box_cells}
+        queue = [self.player_cell]
+
+        for cell in queue:
+            for table in tables:
+                future = table[cell]
+                if future not in seen:
+                    seen.add(future)
+                    queue.append(future)
+
+        return queue
+
+    def normalized(self):
+        ''' Returns the same box layout with the player on the smallest cell of his reachable region'''
+        cell = min(self.reachable_cells())
+        if cell == self.player_cell:
+            return self
+
+        zobrist_player = self.level.zobrist_player
+        zhash = self.zhash ^ zobrist_player[self.player_cell] ^ zobrist_player[cell]
+        return State(self.level, cell, self.box_cells, zhash)
+
+    def macro_successors(self):
+        '''
+        Returns (cell, move, state) for every push / pull reachable from the player region
+        cell is where the player has to walk first, move the box move made from there,
+        state the normalized result
+        '''
+        neighbours = self.level.neighbours
+        zobrist_player = self.level.zobrist_player
+        box_cells = self.box_cells
+        successors = {}
+
+        for cell in self.reachable_cells():
+            zhash = self.zhash ^ zobrist_player[self.player_cell] ^ zobrist_player[cell]
+            standing = State(self.level, cell, box_cells, zhash)
+
+            for move in move_deltas:
+                future = neighbours[move][cell]
+                if future == -1:
+                    continue
+
+                if future in box_cells:
+                    # Push: same as walking into the box
+                    box_move = move
+                elif self.level.allow_pulls and neighbours[opposite_moves[move]][cell] in box_cells:
+                    box_move = move + 4
+                else:
+                    continue
+
+                new_state = standing._successor(box_move)
+                if new_state is None:
+                    continue
+
+                new_state = new_state.normalized()
+                if new_state not in successors:
+                    successors[new_state] = (cell, box_move, new_state)
+
+        return list(successors.values())
+
+    def walk_moves(self, goal_cell):
+        ''' Returns the simple moves that walk the player to goal_cell without moving any box'''
+        neighbours = self.level.neighbours
+        parents = {self.player_cell: None}
+        queue = [self.player_cell]
+
+        for cell in queue:
+            if cell == goal_cell:
+                break
+            for move, table in neighbours.items():
+                future = table[cell]
+                if future != -1 and future not in parents and future not in self.box_cells:
+                    parents[future] = (cell, move)
+                    queue.append(future)
+
+        if goal_cell not in parents:
+            raise ValueError('walk_moves: cell not reachable without moving a box')
+
+        moves = []
+        cell = goal_cell
+        while parents[cell] is not None:
+            cell, move = parents[cell]
+            moves.append(move)
+
+        return moves[::-1]
+
+    def expand_macro(self, macro_steps):
+        ''' Returns the simple moves of (cell, move) macro steps: walk to cell, then make move'''
+        state = self
+        moves = []
+        for cell, move in macro_steps:
+            for simple_move in state.walk_moves(cell) + [move]:
+                state = state.apply_move(simple_move)
+                moves.append(simple_move)
+        return moves
+
+    def __eq__(self, other):
+        # Full comparison backs up the Zobrist hash when two configurations collide
+        if not isinstance(other, State):
+            return NotImplemented
+        return (self.zhash == other.zhash
+                and self.player_cell == other.player_cell
+                and self.box_cells == other.box_cells
+                and self.level is other.level)
+
+    def __hash__(self):
+        return self.zhash
+
+    def __lt__(self, other):
+        return self.key() < other.key()
+
+    def __str__(self):
+        ''' Overriding toString method for State class'''
+        return str(self.to_map())
@@ -0,0 +1,88 @@
+from .moves import *
+
+from array import array
+
+
+__all__ = ['Trace']
+
+
+class Trace:
+    '''
+    Trace Class records a solution as its start state plus one byte per move
+    Any intermediate state is rebuilt on demand by replaying the moves
+
+    Attributes:
+    start: compact state the moves start from
+    moves: array('B') with the move codes from sokoban.moves
+    '''
+    def __init__(self, start, moves=()):
+        self.start = start.to_state()
+        self.moves = array('B', moves)
+        self._final = None
+
+    @classmethod
+    def from_states(cls, states):
+        ''' Builds the trace of a list of consecutive states'''
+        states = [state.to_state() for state in states]
+        trace = cls(states[0])
+        for previous, current in zip(states, states[1:]):
+            for move, successor in previous.successors():
+                if successor == current:
+                    trace.append(move)
+                    break
+            else:
+                raise ValueError('Trace: states are not consecutive')
+        return trace
+
+    def append(self, move):
+        ''' Records one more move'''
+        self.moves.append(move)
+        self._final = None
+
+    def extend(self, moves):
+        ''' Records several moves'''
+        self.moves.extend(moves)
+        self._final = None
+
+    def states(self):
+        ''' Streams the states of the solution, start included, keeping only one in memory'''
+        state = self.start
+        yield state
+        for move in self.moves:
+            state = state.apply_move(move)
+            yield state
+
+    def state_at(self, step):
+        ''' Returns the state after the first step moves'''
+        state = self.start
+        for move in self.moves[:step]:
+            state = state.apply_move(move)
+        return state
+
+    def final_state(self):
+        ''' Returns the state reached after all the moves'''
+        if self._final is None:
+            self._final = self.state_at(len(self.moves))
+        return self._final
+
+    def is_solved(self):
+        ''' Checks if the trace ends with all the boxes on the targets'''
+        return self.final_state().is_solved()
+
+    def pulls(self):
+        ''' Returns the number of moves that drag a box // e.g. _ P B => P B _'''
+        count = 0
+        state = self.start
+        for move in self.moves:
+            if state.is_pull(move):
+                count += 1
+            state = state.apply_move(move)
+        return count
+
+    def __len__(self):
+        ''' Number of moves (steps) of the solution'''
+        return len(self.moves)
+
+    def __str__(self):
+        ''' Overriding toString method for Trace class'''
+        return ' '.join(moves_meaning[move] for move in self.moves)
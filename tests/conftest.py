@@ -0,0 +1,14 @@
+"""
+Shared pytest setup: the repo root on sys.path (the scripts and packages live there)
+and the .yaml maps of this directory.
+"""
+
+import glob
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+MAP_PATHS = sorted(glob.glob(os.path.join(ROOT, 'tests', '*.yaml')))
@@ -0,0 +1,86 @@
+"""
+HeuristicStore: values survive a round trip through the file, old generations are evicted,
+a Zobrist collision or a foreign file never returns a wrong h.
+"""
+
+import os
+from types import SimpleNamespace
+
+from conftest import MAP_PATHS
+from search_methods.hstore import MAX_VALUE, HeuristicStore
+from sokoban.map import Map
+
+
+def some_states(count=20):
+    state = Map.from_yaml(MAP_PATHS[0]).to_state()
+    states = [state]
+    while len(states) < count:
+        state = state.successors()[0][1] if len(states) % 2 else state.successors()[-1][1]
+        if state not in states:
+            states.append(state)
+    return states
+
+
+def test_round_trip(tmp_path):
+    states = some_states()
+    level = states[0].level
+    learned = {state: i + 1 for i, state in enumerate(states)}
+    learned[states[-1]] = 10 ** 12
+
+    store = HeuristicStore(str(tmp_path), level, 'base')
+    store.record(learned)
+    store.flush()
+    store.close()
+
+    store = HeuristicStore(str(tmp_path), level, 'base')
+    for state, value in learned.items():
+        assert store.get(state) == min(value, MAX_VALUE)
+    assert store.stats()["entries"] == len(set(learned))
+    store.close()
+
+
+def test_other_name_is_another_file(tmp_path):
+    state = some_states(1)[0]
+    store = HeuristicStore(str(tmp_path), state.level, 'base')
+    store.record({state: 7})
+    store.flush()
+    assert HeuristicStore(str(tmp_path), state.level, 'push').get(state, -1) == -1
+
+
+def test_evicts_oldest_generation(tmp_path):
+    old, new = some_states(10)[:5], some_states(10)[5:]
+    level = old[0].level
+    store = HeuristicStore(str(tmp_path), level, 'base', max_entries=5)
+    store.record({state: 1 for state in old})
+    store.flush()
+    store.record({state: 2 for state in new})
+    store.flush()
+
+    assert store.evictions == 5
+    assert all(store.get(state) is None for state in old)
+    assert all(store.get(state) == 2 for state in new)
+
+
+def test_zobrist_collision_is_a_miss(tmp_path):
+    state = some_states(1)[0]
+    store = HeuristicStore(str(tmp_path), state.level, 'base')
+    store.record({state: 42})
+    store.flush()
+
+    # Alta stare cu aceeasi cheie Zobrist (o coliziune pe 64 de biti, fortata)
+    other = SimpleNamespace(zhash=state.zhash, player_cell=state.player_cell + 1, box_cells=state.box_cells)
+    assert store.get(state) == 42
+    assert store.get(other, -1) == -1
+
+
+def test_foreign_file_is_ignored_and_rewritten(tmp_path):
+    state = some_states(1)[0]
+    store = HeuristicStore(str(tmp_path), state.level, 'base')
+    with open(store.path, "wb") as f:
+        f.write(b"nu e un fisier lrtah")
+    assert store.get(state, -1) == -1
+
+    store.record({state: 3})
+    store.flush()
+    assert HeuristicStore(str(tmp_path), state.level, 'base').get(state) == 3
+    assert os.path.getsize(store.path) > 0
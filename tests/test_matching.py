@@ -0,0 +1,76 @@
+"""
+Optimal box -> target matching (Hungarian algorithm, incremental updates, the matching heuristics)
+against brute force over every assignment.
+"""
+
+import itertools
+import math
+import os
+import random
+
+import pytest
+
+from conftest import MAP_PATHS
+from search_methods.heuristics import _is_deadlocked, min_matching_distance, min_matching_push_distance
+from search_methods.matching import INF_COST, Assignment
+from sokoban.level import UNREACHABLE
+from sokoban.map import Map
+
+
+def brute_force(cost):
+    """Cheapest assignment of every row to a distinct column."""
+    columns = range(len(cost[0]))
+    return min(sum(cost[i][j] for i, j in enumerate(perm))
+               for perm in itertools.permutations(columns, len(cost)))
+
+
+def random_walk(path, length=150, seed=0):
+    rng = random.Random(seed)
+    state = Map.from_yaml(path).to_state()
+    states = [state]
+    for _ in range(length):
+        succs = state.successors()
+        if not succs:
+            break
+        state = rng.choice(succs)[1]
+        states.append(state)
+    return states
+
+
+@pytest.mark.parametrize('rows, columns', [(1, 1), (3, 3), (4, 6), (6, 6)])
+def test_assignment_is_optimal(rows, columns):
+    rng = random.Random(rows * 10 + columns)
+    for _ in range(50):
+        cost = [[rng.randint(0, 20) for _ in range(columns)] for _ in range(rows)]
+        assert Assignment(range(rows), cost).total == brute_force(cost)
+
+
+@pytest.mark.parametrize('size', [3, 5, 6])
+def test_replaced_row_matches_full_solve(size):
+    rng = random.Random(size)
+    cost = [[rng.randint(0, 20) for _ in range(size)] for _ in range(size)]
+    assignment = Assignment(range(size), cost)
+    for step in range(50):
+        index = rng.randrange(size)
+        row = [rng.randint(0, 20) for _ in range(size)]
+        assignment = assignment.replaced(index, size + step, row)
+        cost[index] = row
+        assert assignment.total == brute_force(cost)
+
+
+@pytest.mark.parametrize('path', MAP_PATHS, ids=os.path.basename)
+def test_matching_heuristics_match_brute_force(path):
+    for state in random_walk(path):
+        level = state.level
+        if _is_deadlocked(state):
+            assert min_matching_distance(state) == math.inf
+            continue
+
+        manhattan = [[abs(x - tx) + abs(y - ty) for tx, ty in level.targets]
+                     for x, y in map(level.coords, state.box_cells)]
+        assert min_matching_distance(state) == brute_force(manhattan)
+
+        push = [[d if d != UNREACHABLE else INF_COST for d in level.box_distance_row(cell)]
+                for cell in state.box_cells]
+        best = brute_force(push)
+        assert min_matching_push_distance(state) == (math.inf if best >= INF_COST else best)
@@ -0,0 +1,18 @@
+"""
+The bitboard move generator against the neighbour tables (the check_movegen.py differential check).
+"""
+
+import os
+import random
+
+import pytest
+
+from check_movegen import check_map
+from conftest import MAP_PATHS
+
+
+@pytest.mark.parametrize('allow_pulls', [True, False])
+@pytest.mark.parametrize('path', MAP_PATHS, ids=os.path.basename)
+def test_bitboards_match_tables(path, allow_pulls):
+    # check_map ridica AssertionError, cu harta si starea, la prima diferenta
+    assert check_map(path, allow_pulls, walks=5, length=200, rng=random.Random(0)) > 0